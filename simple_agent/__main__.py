@@ -1,17 +1,24 @@
 """Main entry point for the simple-agent CLI."""
 
-import argparse
 import sys
 
-from prompt_toolkit import print_formatted_text
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.styles import Style
+from simple_agent import __version__
 
-from simple_agent.core.agent import Agent
+
+def print_version() -> None:
+    """Print the version information."""
+    print(f"simple-agent version {__version__}")
 
 
 def main() -> None:
     """Main entry point for the simple-agent CLI."""
+    # Answer a bare --version before argparse is even imported
+    if sys.argv[1:] == ["--version"]:
+        print_version()
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Simple Agent - A CLI AI agent built on Unix philosophies"
     )
@@ -22,30 +29,27 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.version:
-        version_style = Style.from_dict(
-            {
-                "app": "ansibrightgreen",
-                "version": "ansiyellow",
-            }
-        )
-        print_formatted_text(
-            HTML("<app>simple-agent</app> <version>version 0.1.0</version>"),
-            style=version_style,
-        )
+        print_version()
         return
 
+    # Import the agent only when it will actually run - it pulls in LiteLLM,
+    # MCP and the rest of the runtime, which --version doesn't need
+    from simple_agent.core.agent import Agent
+
     # Run the agent
     agent = Agent()
 
     try:
         agent.run()
     except KeyboardInterrupt:
-        # Handle Ctrl+C with a clean exit via prompt_toolkit
-        print_formatted_text(HTML("<ansiyellow>\nInterrupted. Exiting.</ansiyellow>"))
+        # Handle Ctrl+C with a clean exit, without loading any UI library
+        print("\nInterrupted. Exiting.", file=sys.stderr)
     finally:
         # Ensure MCP servers are shut down cleanly
         if agent.mcp_manager:
             agent.mcp_manager.shutdown_all_sync()
+        # Release pooled HTTP connections
+        agent.llm_client.close()
         sys.exit(0)
 
 
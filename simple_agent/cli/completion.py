@@ -1,5 +1,9 @@
 """Command and completion functionality for the CLI."""
 
+import bisect
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Iterable
 
 from prompt_toolkit.completion import (
@@ -12,6 +16,11 @@ from prompt_toolkit.completion import (
 )
 from prompt_toolkit.document import Document
 
+# Completions for recently typed prefixes are reused for a short time, after
+# which they are recomputed so file completions pick up filesystem changes
+COMPLETION_CACHE_SIZE = 128
+COMPLETION_CACHE_TTL = 2.0
+
 
 class CommandCompleter(PTKCompleter):
     """Command completer for Simple Agent."""
@@ -23,11 +32,25 @@ class CommandCompleter(PTKCompleter):
             "/help": "Show help information",
             "/exit": "Exit the application",
             "/clear": "Clear the screen",
+            "/clear-cache": "Forget cached model responses",
             "/compress": "Compress conversation to context files",
             "/mcp": "View configured MCP servers",
             "\\ + Enter": "to create a new line",
         }
 
+        # Sorted slash commands so completions can be found by binary search
+        self._slash_commands = sorted(
+            (command, description)
+            for command, description in self.commands.items()
+            if command.startswith("/")
+        )
+        self._slash_keys = [command for command, _ in self._slash_commands]
+
+        # Completions already built, keyed by command and start position.
+        # prompt_toolkit keeps completions in its menu state, so they are
+        # shared rather than mutated, and there are only a few per command
+        self._completions: dict[tuple[str, int], Completion] = {}
+
     def get_completions(
         self, document: Document, complete_event: CompleteEvent
     ) -> Iterable[Completion]:
@@ -39,18 +62,23 @@ class CommandCompleter(PTKCompleter):
         if not text_before_cursor.startswith("/"):
             return
 
-        for command, description in self.commands.items():
-            # Skip non-slash commands
-            if not command.startswith("/"):
-                continue
-
-            if command.startswith(text_before_cursor):
-                yield Completion(
+        # Walk forward from the first command >= the prefix while it still matches
+        index = bisect.bisect_left(self._slash_keys, text_before_cursor)
+        while index < len(self._slash_keys) and self._slash_keys[index].startswith(
+            text_before_cursor
+        ):
+            command, description = self._slash_commands[index]
+            key = (command, -len(text_before_cursor))
+            completion = self._completions.get(key)
+            if completion is None:
+                completion = self._completions[key] = Completion(
                     command,
-                    start_position=-len(text_before_cursor),
+                    start_position=key[1],
                     display=command,
                     display_meta=description,
                 )
+            yield completion
+            index += 1
 
 
 class FilePathCompleter(PTKCompleter):
@@ -74,22 +102,26 @@ class FilePathCompleter(PTKCompleter):
         """Get file path completions for the current document."""
         text = document.text_before_cursor
         # Get the last word (after any spaces) to handle file paths in commands
-        text = text.split(" ")[-1]
-        sub_document = Document(text)
+        text = text[text.rfind(" ") + 1 :]
 
         # Only activate for file paths (not commands starting with /)
         # Trigger on: ./, ~/, or absolute paths like /usr/local
         # Don't trigger on single / at start of line (that's for commands)
-        is_file_path = (
-            text.startswith("./")
-            or text.startswith("~/")
-            or (
-                text.startswith("/") and "/" in text[1:]
-            )  # /path/to/file but not just /
-        )
+        is_file_path = text.startswith(("./", "~/")) or (
+            text.startswith("/") and text.find("/", 1) != -1
+        )  # /path/to/file but not just /
+        if not is_file_path:
+            return
 
-        if is_file_path:
-            yield from self.path_completer.get_completions(sub_document, complete_event)
+        # Only build a sub-document once we know the word is a path. Listing
+        # a directory on a slow or unavailable mount can fail transiently,
+        # which should just mean no completions rather than an error
+        try:
+            yield from self.path_completer.get_completions(
+                Document(text), complete_event
+            )
+        except OSError:
+            return
 
 
 class Completer(PTKCompleter):
@@ -100,17 +132,49 @@ class Completer(PTKCompleter):
         self.command_completer = CommandCompleter()
         self.file_completer = FilePathCompleter()
 
+        # Recent completions keyed by the text before the cursor, least
+        # recently used first, with the time they were computed. Completion
+        # runs in a background thread, so access is guarded by a lock
+        self._cache: OrderedDict[str, tuple[float, list[Completion]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def get_completions(
         self, document: Document, complete_event: CompleteEvent
     ) -> Iterable[Completion]:
         """Get completions from all underlying completers."""
-        # Try command completions first
-        cmd_completions = list(
-            self.command_completer.get_completions(document, complete_event)
-        )
-        if cmd_completions:
-            yield from cmd_completions
-            return
+        key = document.text_before_cursor
+        now = time.monotonic()
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None and now - cached[0] < COMPLETION_CACHE_TTL:
+                self._cache.move_to_end(key)
+                completions = cached[1]
+            else:
+                completions = None
+
+        if completions is None:
+            completions = list(self._compute_completions(document, complete_event))
+            with self._cache_lock:
+                self._cache[key] = (now, completions)
+                self._cache.move_to_end(key)
+                if len(self._cache) > COMPLETION_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        yield from completions
+
+    def _compute_completions(
+        self, document: Document, complete_event: CompleteEvent
+    ) -> Iterable[Completion]:
+        """Compute completions, preferring commands over file paths."""
+        # Try command completions first, yielding them as they are produced
+        had_command_completions = False
+        for completion in self.command_completer.get_completions(
+            document, complete_event
+        ):
+            had_command_completions = True
+            yield completion
 
         # If no command completions, try file completions
-        yield from self.file_completer.get_completions(document, complete_event)
+        if not had_command_completions:
+            yield from self.file_completer.get_completions(document, complete_event)
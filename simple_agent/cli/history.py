@@ -0,0 +1,218 @@
+"""Prompt history storage and suggestions for the CLI."""
+
+import atexit
+import bisect
+import contextlib
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from prompt_toolkit.auto_suggest import AutoSuggest, Suggestion
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.document import Document
+from prompt_toolkit.history import FileHistory
+
+# Only the end of the history file is read at startup, so a history that has
+# grown for years doesn't slow down the first prompt
+HISTORY_TAIL_BYTES = 1024 * 1024
+MAX_HISTORY_ENTRIES = 5000
+
+# Histories that may have unwritten entries at exit, held weakly so
+# registering one for the exit flush doesn't keep it alive
+_histories: "weakref.WeakSet[BatchedFileHistory]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Write pending entries for every history before the process exits."""
+    for history in list(_histories):
+        history.flush()
+
+
+class BatchedFileHistory(FileHistory):
+    """File history that appends new entries to disk in batches.
+
+    FileHistory opens and writes the history file for every accepted input,
+    on the prompt thread. This buffers entries in memory and lets a
+    background thread append everything pending in a single write, shortly
+    after an entry arrives. The thread exits once there is nothing left to
+    write, and pending entries are also flushed at exit.
+
+    Loading reads only the tail of the file and keeps the most recent
+    entries, instead of parsing the whole history.
+    """
+
+    def __init__(self, filename: str, flush_delay: float = 0.25) -> None:
+        """Initialize the history.
+
+        Args:
+            filename: Path of the history file
+            flush_delay: Seconds to wait for more entries before writing a batch
+        """
+        super().__init__(filename)
+        self.flush_delay = flush_delay
+
+        # Formatted entries waiting to be written and the thread writing
+        # them, guarded by the lock. Writes happen outside it so the prompt
+        # never waits on the disk; the write lock keeps batches in order
+        self._pending: deque[str] = deque()
+        self._flush_thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        _histories.add(self)
+
+    def load_history_strings(self) -> Iterable[str]:
+        """Load the most recent entries from the end of the history file.
+
+        Returns:
+            Up to MAX_HISTORY_ENTRIES entries, newest first
+        """
+        try:
+            with open(self.filename, "rb") as f:
+                start = max(0, f.seek(0, os.SEEK_END) - HISTORY_TAIL_BYTES)
+                f.seek(start)
+                data = f.read()
+        except OSError:
+            return []
+
+        if start:
+            # Drop the entry cut off by the seek, up to the next timestamp line
+            boundary = data.find(b"\n#")
+            data = data[boundary + 1 :] if boundary != -1 else b""
+
+        # Parse the same way as FileHistory: lines starting with "+" belong to
+        # the current entry and any other line ends it
+        strings: list[str] = []
+        lines: list[str] = []
+        for line in data.decode("utf-8", errors="replace").split("\n"):
+            if line.startswith("+"):
+                lines.append(line[1:])
+            elif lines:
+                strings.append("\n".join(lines))
+                lines = []
+        if lines:
+            strings.append("\n".join(lines))
+
+        # Newest entries have to go first
+        return reversed(strings[-MAX_HISTORY_ENTRIES:])
+
+    def store_string(self, string: str) -> None:
+        """Queue an entry to be appended to the history file.
+
+        Args:
+            string: The accepted input
+        """
+        # Use the same on-disk format as FileHistory, timestamped on arrival
+        lines = "".join(f"+{line}\n" for line in string.split("\n"))
+        entry = f"\n# {datetime.now()}\n{lines}"
+
+        with self._lock:
+            self._pending.append(entry)
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, daemon=True
+                )
+                self._flush_thread.start()
+
+    def flush(self) -> None:
+        """Append all pending entries to the history file in one write."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, deque()
+            if not pending:
+                return
+
+            # History is best effort, a failed write shouldn't break the prompt
+            with contextlib.suppress(OSError), open(self.filename, "ab") as f:
+                f.write("".join(pending).encode("utf-8"))
+
+    def _flush_loop(self) -> None:
+        """Write pending entries in the background until there are none left."""
+        while True:
+            # Give entries that arrive in quick succession a chance to join
+            # the same batch
+            time.sleep(self.flush_delay)
+            # History is best effort, so keep writing later entries even if
+            # this batch failed
+            with contextlib.suppress(Exception):
+                self.flush()
+
+            with self._lock:
+                if not self._pending:
+                    self._flush_thread = None
+                    return
+
+
+class IndexedAutoSuggest(AutoSuggest):
+    """Suggest the most recent history line starting with the current input.
+
+    Gives the same suggestions as prompt_toolkit's AutoSuggestFromHistory,
+    which splits and scans every history entry on each keystroke. This keeps
+    the history lines in a sorted index, rebuilt only when the history
+    changes, and finds the lines with a matching prefix by binary search.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the suggester with an empty index."""
+        # Distinct history lines in sorted order, and the position of each
+        # line's most recent use
+        self._lines: list[str] = []
+        self._recency: dict[str, int] = {}
+
+        # Number of history strings the index was built from. History only
+        # grows, so a different count means the index is out of date
+        self._indexed_count = 0
+
+    def get_suggestion(self, buffer: Buffer, document: Document) -> Suggestion | None:
+        """Get the suggestion for the current input.
+
+        Args:
+            buffer: The buffer being edited
+            document: The current document
+
+        Returns:
+            The rest of the most recent matching history line, or None
+        """
+        # Consider only the last line, and only if it isn't blank
+        text = document.text.rsplit("\n", 1)[-1]
+        if not text.strip():
+            return None
+
+        strings = buffer.history.get_strings()
+        if not strings:
+            return None
+        if len(strings) != self._indexed_count:
+            self._build_index(strings)
+
+        # Pick the most recent of the lines sharing the prefix
+        best = None
+        index = bisect.bisect_left(self._lines, text)
+        while index < len(self._lines) and self._lines[index].startswith(text):
+            line = self._lines[index]
+            if best is None or self._recency[line] > self._recency[best]:
+                best = line
+            index += 1
+
+        return Suggestion(best[len(text) :]) if best is not None else None
+
+    def _build_index(self, strings: list[str]) -> None:
+        """Index the lines of the history strings.
+
+        Args:
+            strings: History strings, oldest first
+        """
+        recency: dict[str, int] = {}
+        position = 0
+        for string in strings:
+            for line in string.splitlines():
+                recency[line] = position
+                position += 1
+
+        self._recency = recency
+        self._lines = sorted(recency)
+        self._indexed_count = len(strings)
@@ -1,14 +1,15 @@
 """Prompt Toolkit interface for Simple Agent."""
 
 import os
+import sys
 from collections.abc import Callable
 from enum import Enum
 from typing import Any
 
 from prompt_toolkit import PromptSession
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+from prompt_toolkit.document import Document
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
+from prompt_toolkit.history import History, ThreadedHistory
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.key_binding.key_processor import KeyPressEvent
 from prompt_toolkit.keys import Keys
@@ -17,6 +18,7 @@ from prompt_toolkit.styles import Style
 from rich.padding import Padding
 
 from simple_agent.cli.completion import Completer
+from simple_agent.cli.history import BatchedFileHistory, IndexedAutoSuggest
 from simple_agent.config import config
 from simple_agent.display import (
     console,
@@ -38,6 +40,65 @@ class CLIMode(Enum):
 NORMAL_PROMPT = HTML("<prompt.arrow>></prompt.arrow> ")
 SHELL_PROMPT = HTML("<prompt.arrow>!</prompt.arrow> ")
 
+# Prompt history file in the user's home directory, resolved once
+HISTORY_FILE = os.path.expanduser("~/.simple_agent_history")
+
+# Maximum characters of each output stream of a shell-mode command passed to
+# the agent. Longer output is cut from the front, keeping the end where the
+# result and any errors usually are
+SHELL_OUTPUT_LIMIT = 20000
+
+# Prompt style, parsed once and shared by every CLI instance
+PROMPT_STYLE = Style.from_dict(
+    {
+        "prompt": "ansibrightyellow",
+        "prompt.arrow": "ansiwhite",
+        "continuation": "ansibrightblack",
+        "user-input": "ansiwhite",
+        # Completion menu colors - gray palette
+        "completion-menu.completion": "bg:#444444 #ffffff",
+        "completion-menu.completion.current": "bg:#666666 #ffffff",
+        "completion-menu.meta.completion": "bg:#333333 #aaaaaa",
+        "completion-menu.meta.completion.current": "bg:#555555 #ffffff",
+        "completion-menu.multi-column-meta": "bg:#444444 #aaaaaa",
+        # Scrollbar colors
+        "scrollbar.background": "bg:#88aaaa",
+        "scrollbar.button": "bg:#222222",
+        # Highlighting for command syntax
+        "command": "#aaccff",
+        "special-command": "#ffcc00",
+    }
+)
+
+
+def prompt_continuation(width: int, line_number: int, is_soft_wrap: int) -> str:
+    """Get the prefix for continuation lines of a multiline prompt.
+
+    Args:
+        width: Width of the prompt
+        line_number: Line number of the continuation line
+        is_soft_wrap: Whether the line is wrapped rather than a new line
+
+    Returns:
+        Indentation aligning new lines with the input, nothing for wrapped lines
+    """
+    return "" if is_soft_wrap else "  "
+
+
+def truncate_output(output: str) -> str:
+    """Shorten command output to the last SHELL_OUTPUT_LIMIT characters.
+
+    Args:
+        output: Output of a shell command
+
+    Returns:
+        The output, with a marker in place of any characters cut from the start
+    """
+    if len(output) <= SHELL_OUTPUT_LIMIT:
+        return output
+    omitted = len(output) - SHELL_OUTPUT_LIMIT
+    return f"[... {omitted} characters omitted ...]\n{output[omitted:]}"
+
 
 def setup_keybindings(cli: "CLI") -> KeyBindings:
     """Set up key bindings for the prompt session.
@@ -57,7 +118,7 @@ def setup_keybindings(cli: "CLI") -> KeyBindings:
         buffer = event.app.current_buffer
 
         # If there is nothing to clear, exit the application
-        if cli.mode == CLIMode.NORMAL and not buffer.text:
+        if cli.mode is CLIMode.NORMAL and not buffer.text:
             event.app.exit(exception=KeyboardInterrupt())
 
         # Clear the buffer
@@ -108,14 +169,28 @@ def setup_keybindings(cli: "CLI") -> KeyBindings:
         # Get current buffer
         buffer = event.app.current_buffer
 
-        # Check if the current line ends with a backslash
-        current_line = buffer.document.current_line
-        if current_line.endswith("\\"):
-            # Remove the backslash
-            if cli.mode == CLIMode.NORMAL:
-                buffer.delete_before_cursor(1)
+        # Check if the input ends with a backslash at the cursor. Looking at
+        # one character avoids building a Document for the whole input
+        cursor = buffer.cursor_position
+        if cursor and buffer.text[cursor - 1] == "\\":
+            if cli.mode is CLIMode.NORMAL:
+                # Replace the backslash with a newline in a single edit, so
+                # the buffer is only updated and redrawn once. Like
+                # Buffer.newline, the new line keeps the current indentation
+                document = buffer.document
+                text_before_cursor = (
+                    document.text_before_cursor[:-1]
+                    + "\n"
+                    + document.leading_whitespace_in_current_line
+                )
+                buffer.document = Document(
+                    text_before_cursor + document.text_after_cursor,
+                    len(text_before_cursor),
+                )
+                return
 
-            # Insert a newline (multiline mode will handle the indentation)
+            # Keep the backslash for the shell and insert a newline
+            # (multiline mode will handle the indentation)
             buffer.newline()
             return
 
@@ -140,6 +215,7 @@ Help you execute on short-term tasks and long-term goals.
 [bold]Commands:[/bold]
 • [green]/help[/green]:          Show this help message
 • [green]/clear[/green]:         Clear the terminal screen and conversation history
+• [green]/clear-cache[/green]:   Forget cached model responses
 • [green]/compress[/green]:      Compress conversation to context files
 • [green]/mcp[/green]:           View configured MCP servers
 • [green]/exit[/green]:          Exit the agent
@@ -152,6 +228,26 @@ Help you execute on short-term tasks and long-term goals.
 Just ask me what to work on next, and I'll help you prioritize.
 """
 
+# Welcome box shown when the interactive loop starts
+WELCOME_MESSAGE = """
+┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓
+┃          🤖 Simple Agent                      ┃
+┃                                                ┃
+┃ /help           for available commands         ┃
+┃ /clear          clear screen & conversation    ┃
+┃ /clear-cache    forget cached responses        ┃
+┃ /compress       compress to context files      ┃
+┃ /mcp            view MCP servers               ┃
+┃ /exit           to quit                        ┃
+┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛
+"""
+
+# Help and welcome text with markup parsed once, ready to print as-is
+HELP_RENDERABLE = Padding(console.render_str(HELP_TEXT), (0, 0, 0, 2))
+WELCOME_RENDERABLE = Padding(
+    console.render_str(f"[bold white]{WELCOME_MESSAGE}[/bold white]"), (0, 0, 0, 2)
+)
+
 
 class CLI:
     """Interactive CLI for Simple Agent."""
@@ -163,6 +259,7 @@ class CLI:
         message_manager: Any | None = None,
         mcp_manager: Any | None = None,
         mcp_errors: dict[str, str] | None = None,
+        llm_client: Any | None = None,
     ) -> None:
         """Initialize the CLI.
 
@@ -172,64 +269,85 @@ class CLI:
             message_manager: Optional message manager for clearing conversation history
             mcp_manager: Optional MCP manager for displaying server status
             mcp_errors: Optional dictionary of MCP server load errors
+            llm_client: Optional LLM client for clearing its response cache
         """
         self.process_input = process_input_callback
         self.on_start_callback = on_start_callback
         self.message_manager = message_manager
         self.mcp_manager = mcp_manager
         self.mcp_errors = mcp_errors or {}
+        self.llm_client = llm_client
         self.mode = CLIMode.NORMAL
+        self.style = PROMPT_STYLE
+
+        # Slash command handlers, keyed by the lowercased command name. Each
+        # takes the full input line and returns True to exit the loop
+        self._commands: dict[str, Callable[[str], bool]] = {
+            "/exit": self._cmd_exit,
+            "/help": self._cmd_help,
+            "/clear": self._cmd_clear,
+            "/clear-cache": self._cmd_clear_cache,
+            "/compress": self._cmd_compress,
+            "/mcp": self._cmd_mcp,
+        }
+
+        # The prompt session is built on first use so callers that never
+        # prompt (e.g. only show help) skip prompt_toolkit's setup cost
+        self._session: PromptSession | None = None
+
+    @property
+    def session(self) -> PromptSession:
+        """Get the prompt session, creating it on first access."""
+        return self._get_session()
+
+    def _get_session(self) -> PromptSession:
+        """Create the prompt session if it doesn't exist yet.
 
-        # Set up prompt style
-        self.style = Style.from_dict(
-            {
-                "prompt": "ansibrightyellow",
-                "prompt.arrow": "ansiwhite",
-                "continuation": "ansibrightblack",
-                "user-input": "ansiwhite",
-                # Completion menu colors - gray palette
-                "completion-menu.completion": "bg:#444444 #ffffff",
-                "completion-menu.completion.current": "bg:#666666 #ffffff",
-                "completion-menu.meta.completion": "bg:#333333 #aaaaaa",
-                "completion-menu.meta.completion.current": "bg:#555555 #ffffff",
-                "completion-menu.multi-column-meta": "bg:#444444 #aaaaaa",
-                # Scrollbar colors
-                "scrollbar.background": "bg:#88aaaa",
-                "scrollbar.button": "bg:#222222",
-                # Highlighting for command syntax
-                "command": "#aaccff",
-                "special-command": "#ffcc00",
-            }
-        )
+        Returns:
+            The prompt session used for interactive input
+        """
+        if self._session is not None:
+            return self._session
 
-        # Try to set up history file in user's home directory
-        history_file = os.path.expanduser("~/.simple_agent_history")
-        try:
-            history = FileHistory(history_file)
-        except Exception:
-            # Fall back to no history if file can't be created
-            history = None
+        # Typing-time completion and mouse tracking only help a person at a
+        # terminal, so skip them when input is piped or output redirected
+        interactive = sys.stdin.isatty() and sys.stdout.isatty()
 
         # Create prompt session with advanced features
-        self.session: PromptSession = PromptSession(
-            history=history,
-            auto_suggest=AutoSuggestFromHistory(),
+        self._session = PromptSession(
+            message=NORMAL_PROMPT,
+            history=self._init_history(),
+            auto_suggest=IndexedAutoSuggest(),
             completer=Completer(),
             key_bindings=setup_keybindings(self),
             style=self.style,
-            complete_while_typing=True,
-            complete_in_thread=True,  # Perform completion in a background thread
-            mouse_support=True,  # Enable mouse support for selection
+            complete_while_typing=interactive,
+            complete_in_thread=interactive,  # Perform completion in a background thread
+            mouse_support=interactive,  # Enable mouse support for selection
             wrap_lines=True,  # Wrap long lines
             multiline=True,  # Enable proper multiline support
-            prompt_continuation=lambda width, line_number, is_soft_wrap: (
-                "  " if not is_soft_wrap else ""
-            ),
+            prompt_continuation=prompt_continuation,
         )
+        return self._session
+
+    def _init_history(self) -> History | None:
+        """Set up the prompt history file.
+
+        Returns:
+            The file history, or None to keep history in memory
+        """
+        # Skip history when there is no home directory to write to (e.g. in
+        # containers or cron jobs)
+        if not os.path.isdir(os.path.dirname(HISTORY_FILE)):
+            return None
+
+        # Read the history file in a background thread so a long history
+        # doesn't delay the first prompt, and append new entries in batches
+        return ThreadedHistory(BatchedFileHistory(HISTORY_FILE))
 
     def show_help(self) -> None:
         """Display help information."""
-        console.print(Padding(HELP_TEXT, (0, 0, 0, 2)))
+        console.print(HELP_RENDERABLE)
 
     def show_mcp_servers(self) -> None:
         """Display configured MCP servers and their status."""
@@ -251,24 +369,75 @@ class CLI:
             )
             console.print()
 
-        console.print()
-        console.print(
-            Padding("[bold cyan]Configured MCP Servers:[/bold cyan]", (0, 0, 0, 2))
-        )
+        # Look up the error and session maps once rather than per server
+        errors = self.mcp_errors
+        sessions = self.mcp_manager.sessions if self.mcp_manager else {}
 
+        lines = ["[bold cyan]Configured MCP Servers:[/bold cyan]"]
         for server_name in config.mcp_servers:
             # Check if server is running or has errors
-            if server_name in self.mcp_errors:
+            if server_name in errors:
                 status = "[red]failed to load[/red]"
-            elif self.mcp_manager and server_name in self.mcp_manager.sessions:
+            elif server_name in sessions:
                 status = "[green]running[/green]"
             else:
                 status = "[red]not running[/red]"
 
-            console.print(Padding(f"{server_name} - {status}", (0, 0, 0, 2)))
+            lines.append(f"{server_name} - {status}")
 
+        # Render the whole list at once rather than one console write per server
+        console.print()
+        console.print(Padding("\n".join(lines), (0, 0, 0, 2)))
         console.print()
 
+    def _cmd_exit(self, user_input: str) -> bool:
+        """Handle the /exit command."""
+        display_exit("Goodbye! Simple Agent shutting down")
+        return True
+
+    def _cmd_help(self, user_input: str) -> bool:
+        """Handle the /help command."""
+        self.show_help()
+        return False
+
+    def _cmd_clear(self, user_input: str) -> bool:
+        """Handle the /clear command."""
+        clear()
+        # Also clear message history if message manager is available
+        if self.message_manager:
+            self.message_manager.clear()
+            console.print(
+                Padding("[green]Conversation history cleared.[/green]", (0, 0, 0, 2))
+            )
+        # Forget cached responses too, so a new conversation that starts the
+        # same way gets fresh answers rather than ones from before the clear
+        if self.llm_client:
+            self.llm_client.clear_cache()
+        return False
+
+    def _cmd_clear_cache(self, user_input: str) -> bool:
+        """Handle the /clear-cache command."""
+        if self.llm_client:
+            self.llm_client.clear_cache()
+            console.print(
+                Padding("[green]Response cache cleared.[/green]", (0, 0, 0, 2))
+            )
+        return False
+
+    def _cmd_compress(self, user_input: str) -> bool:
+        """Handle the /compress command."""
+        # Extract optional instructions after /compress
+        parts = user_input.split(maxsplit=1)
+        instructions = parts[1] if len(parts) > 1 else ""
+        # Pass to process_input with special marker
+        self.process_input(f"__COMPRESS__{instructions}")
+        return False
+
+    def _cmd_mcp(self, user_input: str) -> bool:
+        """Handle the /mcp command."""
+        self.show_mcp_servers()
+        return False
+
     def set_mode(self, mode: CLIMode) -> bool:
         """Set the current interaction mode.
 
@@ -278,12 +447,12 @@ class CLI:
         Returns:
             True if successful, False otherwise
         """
-        if self.mode == mode:
+        if self.mode is mode:
             return False
         self.mode = mode
-        if self.mode == CLIMode.NORMAL:
+        if self.mode is CLIMode.NORMAL:
             self.session.message = NORMAL_PROMPT
-        elif self.mode == CLIMode.SHELL:
+        elif self.mode is CLIMode.SHELL:
             self.session.message = SHELL_PROMPT
         else:
             raise ValueError(f"Invalid mode: {mode}")
@@ -293,77 +462,43 @@ class CLI:
     def run_interactive_loop(self) -> None:
         """Run the interactive prompt loop."""
         # Display welcome message with styling
-        welcome_message = """
-┏━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┓
-┃          🤖 Simple Agent                      ┃
-┃                                                ┃
-┃ /help           for available commands         ┃
-┃ /clear          clear screen & conversation    ┃
-┃ /compress       compress to context files      ┃
-┃ /mcp            view MCP servers               ┃
-┃ /exit           to quit                        ┃
-┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛
-"""
         # Using direct console.print since we want custom formatting for the welcome box
-        console.print(
-            Padding(f"[bold white]{welcome_message}[/bold white]", (0, 0, 0, 2))
-        )
+        console.print(WELCOME_RENDERABLE)
 
         # Call on_start_callback after splash screen (if provided)
         if self.on_start_callback:
             self.on_start_callback()
 
+        session = self._get_session()
+
         while True:
             try:
-                # Get input from user with proper formatting and completions
-                user_input = self.session.prompt(
-                    NORMAL_PROMPT,
-                    complete_in_thread=True,
-                )
+                # Get input from user with proper formatting and completions,
+                # using the prompt message that set_mode keeps up to date
+                user_input = session.prompt()
 
-                # Skip empty input
-                if not user_input.strip():
+                # Skip empty input, without copying large pastes to strip them
+                if not user_input or user_input.isspace():
                     continue
 
-                # Check for slash commands
-                if user_input.lower() == "/exit":
-                    display_exit("Goodbye! Simple Agent shutting down")
-                    break
-                elif user_input.lower() == "/help":
-                    self.show_help()
-                    continue
-                elif user_input.lower() == "/clear":
-                    clear()
-                    # Also clear message history if message manager is available
-                    if self.message_manager:
-                        self.message_manager.clear()
-                        console.print(
-                            Padding(
-                                "[green]Conversation history cleared.[/green]",
-                                (0, 0, 0, 2),
-                            )
-                        )
-                    continue
-                elif user_input.lower().startswith("/compress"):
-                    # Extract optional instructions after /compress
-                    parts = user_input.split(maxsplit=1)
-                    instructions = parts[1] if len(parts) > 1 else ""
-                    # Pass to process_input with special marker
-                    self.process_input(f"__COMPRESS__{instructions}")
-                    continue
-                elif user_input.lower() == "/mcp":
-                    self.show_mcp_servers()
-                    continue
-                elif user_input.startswith("/"):
-                    # Handle unknown slash commands
-                    display_warning(f"Unknown command: {user_input}")
+                # Check for slash commands, lowercasing only the command name
+                # rather than the whole (possibly large) input
+                if user_input.startswith("/"):
+                    command = user_input.split(None, 1)[0].lower()
+                    handler = self._commands.get(command)
+                    if handler is None:
+                        display_warning(f"Unknown command: {user_input}")
+                    elif handler(user_input):
+                        break
                     continue
 
-                if self.mode == CLIMode.SHELL:
+                if self.mode is CLIMode.SHELL:
                     # Execute the command
                     stdout, stderr, return_code = execute_command(user_input)
 
-                    # Format combined input for the agent context
+                    # Format combined input for the agent context, keeping
+                    # very long output from flooding the conversation
+                    stdout, stderr = truncate_output(stdout), truncate_output(stderr)
                     context_message = f"Command:\n```bash\n$ {user_input}\n```\nOutput:\n```\n{stdout}\n{stderr}\n```\nReturn code: {return_code}\n"
 
                     # Process the command and output as a message to the agent
@@ -381,6 +516,8 @@ class CLI:
             except EOFError:
                 display_exit("Received EOF")
                 break
+            except OSError as e:
+                display_error("I/O error", e)
             except Exception as e:
                 display_error("Unexpected error", e)
 
@@ -5,7 +5,7 @@ import os
 from pathlib import Path
 
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from simple_agent.display import display_warning
 
@@ -47,6 +47,10 @@ class MCPServerConfig(BaseModel):
     )
 
 
+# Validates a whole mcp_servers.json mapping in a single pydantic-core call
+MCP_SERVERS_ADAPTER = TypeAdapter(dict[str, MCPServerConfig])
+
+
 class Config(BaseModel):
     """Application configuration."""
 
@@ -70,16 +74,11 @@ def load_mcp_config() -> dict[str, MCPServerConfig]:
     config_dir = get_config_dir()
     config_path = config_dir / "mcp_servers.json"
 
-    if not config_path.exists():
-        return {}
-
     try:
-        with open(config_path) as f:
-            data = json.load(f)
-            return {
-                name: MCPServerConfig.model_validate(server_config)
-                for name, server_config in data.items()
-            }
+        data = json.loads(config_path.read_bytes())
+        return MCP_SERVERS_ADAPTER.validate_python(data)
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         # Show warning if config file is invalid
         display_warning(f"Failed to load {config_path}", e)
@@ -1,6 +1,7 @@
 """System prompt for compression workflow."""
 
-from datetime import datetime
+import re
+from datetime import date
 
 COMPRESSION_SYSTEM_PROMPT = """Today's date: {today}
 
@@ -102,6 +103,12 @@ When updating goals, include progress tracking:
 {user_instructions}
 """
 
+# The template split around its two placeholders once, so building the system
+# prompt is a plain concatenation instead of a str.format parse each time
+_PROMPT_HEAD, _PROMPT_MIDDLE, _PROMPT_TAIL = re.split(
+    r"\{today\}|\{user_instructions\}", COMPRESSION_SYSTEM_PROMPT
+)
+
 
 def get_compression_prompt(
     conversation_history: list[dict],
@@ -117,10 +124,10 @@ def get_compression_prompt(
         Messages list with system prompt and conversation summary
     """
     # Build system prompt with today's date and user instructions
-    today = datetime.now().strftime("%Y-%m-%d")
-    system_prompt = COMPRESSION_SYSTEM_PROMPT.format(
-        today=today,
-        user_instructions=user_instructions or "No specific instructions provided.",
+    today = date.today().isoformat()
+    user_instructions = user_instructions or "No specific instructions provided."
+    system_prompt = (
+        f"{_PROMPT_HEAD}{today}{_PROMPT_MIDDLE}{user_instructions}{_PROMPT_TAIL}"
     )
 
     # Format conversation for review
@@ -156,33 +163,44 @@ def _format_conversation(messages: list[dict]) -> str:
     Returns:
         Formatted conversation text
     """
-    lines = ["# Conversation History", ""]
-
-    for msg in messages:
-        role = msg.get("role", "unknown")
-        content = msg.get("content", "")
-
-        if role == "system":
-            # Skip system prompts in compression review
-            continue
-        elif role == "user":
-            lines.append(f"**User:** {content}")
-            lines.append("")
-        elif role == "assistant":
-            if msg.get("tool_calls"):
-                # Show tool calls
-                for tc in msg.get("tool_calls", []):
-                    func = tc.get("function", {})
-                    tool_name = func.get("name", "unknown")
-                    lines.append(f"**Assistant:** [Called tool: {tool_name}]")
-                lines.append("")
-            elif content:
-                lines.append(f"**Assistant:** {content}")
-                lines.append("")
-        elif role == "tool":
-            # Show tool results briefly
-            tool_name = msg.get("name", "unknown")
-            lines.append(f"**Tool Result ({tool_name}):** {content[:200]}...")
-            lines.append("")
-
-    return "\n".join(lines)
+    # Format each message as one block and join them all at once, with a
+    # blank line after every block
+    blocks = (_format_message(msg) for msg in messages)
+    return "\n".join(["# Conversation History", "", *filter(None, blocks)])
+
+
+def _format_message(msg: dict) -> str | None:
+    """Format a single message for compression review.
+
+    Args:
+        msg: Conversation message
+
+    Returns:
+        The message's lines, each followed by a newline, or None to skip it
+    """
+    role = msg.get("role", "unknown")
+    content = msg.get("content", "")
+
+    if role == "user":
+        return f"**User:** {content}\n"
+    if role == "assistant":
+        tool_calls = msg.get("tool_calls")
+        if tool_calls:
+            # Show tool calls
+            tool_names = (
+                tc.get("function", {}).get("name", "unknown") for tc in tool_calls
+            )
+            return "".join(
+                f"**Assistant:** [Called tool: {tool_name}]\n"
+                for tool_name in tool_names
+            )
+        if content:
+            return f"**Assistant:** {content}\n"
+        return None
+    if role == "tool":
+        # Show tool results briefly
+        tool_name = msg.get("name", "unknown")
+        return f"**Tool Result ({tool_name}):** {content[:200]}...\n"
+
+    # Skip system prompts and unknown roles in compression review
+    return None
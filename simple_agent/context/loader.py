@@ -23,18 +23,29 @@ def load_context_from_directory(context_dir: Path | str | None = None) -> str:
     if not markdown_files:
         return ""
 
-    # Load and combine all markdown files
+    # Load and combine all markdown files, adding a file header for context
     context_parts = []
     for md_file in markdown_files:
-        try:
-            with open(md_file, encoding="utf-8") as f:
-                content = f.read().strip()
-                if content:
-                    # Add file header for context
-                    context_parts.append(f"# Context from {md_file.name}\n\n{content}")
-        except Exception as e:
-            # Skip files that can't be read
-            print(f"Warning: Could not read context file {md_file}: {e}")
-            continue
+        content = _read_context_file(md_file)
+        if content:
+            context_parts.append(f"# Context from {md_file.name}\n\n{content}")
 
     return "\n\n---\n\n".join(context_parts)
+
+
+def _read_context_file(md_file: Path) -> str | None:
+    """Read a context file.
+
+    Args:
+        md_file: Path to the markdown file
+
+    Returns:
+        The file's content without surrounding whitespace, or None if it
+        can't be read
+    """
+    try:
+        return md_file.read_text(encoding="utf-8").strip()
+    except Exception as e:
+        # Skip files that can't be read
+        print(f"Warning: Could not read context file {md_file}: {e}")
+        return None
@@ -2,13 +2,12 @@
 
 import contextlib
 import json
+import threading
 import time
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
-from rich.markdown import Markdown
-
 from simple_agent.cli.prompt import CLI, CLIMode
 from simple_agent.config import config
 from simple_agent.context.compression_prompt import get_compression_prompt
@@ -145,11 +144,27 @@ class Agent:
 
         return prompt
 
+    def _on_start(self) -> None:
+        """Run startup work once the welcome banner has been shown."""
+        # Load LiteLLM and connect to the API while the user types their
+        # first prompt
+        self.llm_client.prewarm()
+        threading.Thread(target=self._prewarm_imports, daemon=True).start()
+        self._display_loaded_messages()
+
+    def _prewarm_imports(self) -> None:
+        """Import modules deferred from startup that the first response needs."""
+        with contextlib.suppress(Exception):
+            import rich.markdown  # noqa: F401
+
     def _display_loaded_messages(self) -> None:
         """Display previously loaded conversation messages on startup."""
         if len(self.messages) == 0:
             return
 
+        # Markdown rendering is imported on first use to keep startup fast
+        from rich.markdown import Markdown
+
         # Show count of loaded messages
         message_count = len(self.messages)
         display_info(f"Resuming conversation ({message_count} messages loaded)\n")
@@ -233,10 +248,11 @@ class Agent:
         # Create CLI instance with callback to process input
         self.cli = CLI(
             process_input_callback=self._process_input,
-            on_start_callback=self._display_loaded_messages,
+            on_start_callback=self._on_start,
             message_manager=self.messages,
             mcp_manager=self.mcp_manager,
             mcp_errors=self.mcp_errors,
+            llm_client=self.llm_client,
         )
 
         # Run the interactive prompt loop
@@ -284,9 +300,11 @@ class Agent:
         Args:
             message: The user's message
         """
+        from rich.markdown import Markdown
+
         # Add user message to history
         self.messages.append({"role": "user", "content": message})
-        if self.cli.mode != CLIMode.NORMAL:
+        if self.cli.mode is not CLIMode.NORMAL:
             return
 
         # Process the request with tool call handling (using a loop)
@@ -383,6 +401,12 @@ class Agent:
 
         display_info("Starting compression workflow...")
 
+        # Ask the model afresh rather than replaying cached responses (and
+        # their file edits) from an earlier interrupted or rejected run
+        self.llm_client.clear_cache()
+
+        from rich.markdown import Markdown
+
         # Build compression messages
         compression_messages = get_compression_prompt(
             conversation_history=conversation_history,
@@ -5,7 +5,6 @@ from typing import Any
 
 from rich.console import RenderableType
 from rich.padding import Padding
-from rich.traceback import Traceback
 
 from simple_agent.live_console import console, live_confirmation
 
@@ -144,6 +143,9 @@ def display_error(message: str, err: Exception | None = None) -> None:
         from simple_agent.live_console import live_display
 
         if live_display is None:
+            # Traceback pulls in pygments, so only import it when rendering one
+            from rich.traceback import Traceback
+
             # Only show traceback in console output if no live display
             console.print(
                 Traceback.from_exception(
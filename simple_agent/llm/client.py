@@ -1,16 +1,30 @@
 """LLM client for model integration."""
 
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
 from typing import Any
 
-import litellm
-
 from simple_agent.config import config
 from simple_agent.display import display_error
 
+# Host contacted to warm up the connection pool before the first request,
+# unless requests are routed to another base URL
+ANTHROPIC_API_URL = "https://api.anthropic.com/"
+
+# Maximum number of responses kept in the in-process response cache
+RESPONSE_CACHE_SIZE = 128
+
 
 class LLMClient:
     """Client for interacting with Large Language Model APIs."""
 
+    # LiteLLM takes seconds to import, so it is loaded on the first request
+    _litellm: Any = None
+
     def __init__(self, api_key: str | None = None) -> None:
         """Initialize the LLM client.
 
@@ -24,8 +38,181 @@ class LLMClient:
         self.tokens_received = 0
         self.completion_cost = 0.0
 
-        # Configure LiteLLM
-        litellm.drop_params = True  # Don't send unnecessary params
+        # litellm.completion, resolved once on the first request
+        self._completion: Any = None
+
+        # Pooled HTTP client for Anthropic requests, created on first use so
+        # connections (and their TLS sessions) are kept alive between turns
+        self._http_client: Any = None
+        self._http_client_lock = threading.Lock()
+
+        # Mark the system prompt for Anthropic's prompt cache so the stable
+        # prefix isn't reprocessed and billed in full every turn
+        self.enable_prompt_cache = True
+
+        # Recent responses keyed by a hash of the request, least recently
+        # used first, so identical requests are answered without an API call
+        self._response_cache: OrderedDict[bytes, Any] = OrderedDict()
+
+    @classmethod
+    def _ensure_litellm(cls) -> Any:
+        """Import and configure LiteLLM the first time it is needed.
+
+        Returns:
+            The litellm module
+        """
+        if cls._litellm is None:
+            import litellm
+
+            # Configure LiteLLM
+            litellm.drop_params = True  # Don't send unnecessary params
+            cls._litellm = litellm
+        return cls._litellm
+
+    def _get_http_client(self) -> Any:
+        """Get the pooled HTTP client, creating it on first use.
+
+        Returns:
+            A LiteLLM HTTP handler with a keep-alive connection pool
+        """
+        # The prewarm thread may race the first request to create the client
+        with self._http_client_lock:
+            if self._http_client is None:
+                import httpx
+                from litellm.llms.custom_httpx.http_handler import HTTPHandler
+
+                # Let LiteLLM build the httpx client so its SSL settings
+                # (SSL_VERIFY, SSL_CERTIFICATE, ...) apply. Requests pass their
+                # own timeout, so this one only matches LiteLLM's default
+                self._http_client = HTTPHandler(
+                    timeout=httpx.Timeout(600.0, connect=5.0)
+                )
+            return self._http_client
+
+    def _uses_anthropic(self, litellm: Any) -> bool:
+        """Check whether the configured model is served by the Anthropic API.
+
+        Only LiteLLM's Anthropic provider accepts an HTTPHandler as its client,
+        other providers expect their own SDK client types.
+
+        Args:
+            litellm: The litellm module
+
+        Returns:
+            True if requests for the configured model go to Anthropic
+        """
+        try:
+            _, provider, _, _ = litellm.get_llm_provider(config.llm.model)
+        except Exception:
+            return False
+        return bool(provider == "anthropic")
+
+    def _anthropic_api_base(self, litellm: Any) -> str:
+        """Get the base URL LiteLLM sends Anthropic requests to.
+
+        Follows LiteLLM's own lookup, so a configured gateway or proxy is
+        warmed up instead of the public API it routes around.
+
+        Args:
+            litellm: The litellm module
+
+        Returns:
+            The configured base URL, or the public Anthropic API
+        """
+        return str(
+            litellm.api_base
+            or os.environ.get("ANTHROPIC_API_BASE")
+            or os.environ.get("ANTHROPIC_BASE_URL")
+            or ANTHROPIC_API_URL
+        )
+
+    def prewarm(self) -> None:
+        """Warm up LiteLLM and the API connection in the background.
+
+        Importing LiteLLM and the TCP and TLS handshakes then happen while the
+        user is typing, and the first request finds LiteLLM already loaded and
+        reuses the established pooled connection.
+        """
+        threading.Thread(target=self._prewarm, daemon=True).start()
+
+    def _prewarm(self) -> None:
+        """Load LiteLLM and connect the pooled HTTP client to the API."""
+        # Best effort only - a failed warmup just means a cold first request
+        with contextlib.suppress(Exception):
+            litellm = self._ensure_litellm()
+            if self._completion is None:
+                self._completion = litellm.completion
+
+            if self.api_key and self._uses_anthropic(litellm):
+                api_base = self._anthropic_api_base(litellm)
+                self._get_http_client().client.head(api_base, timeout=5.0)
+
+    def _with_prompt_cache(
+        self, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Mark the leading system message as cacheable for Claude models.
+
+        Args:
+            messages: List of conversation messages in chat format
+
+        Returns:
+            A new list with a tagged copy of the system message, or the
+            original list if there is nothing to tag
+        """
+        model = config.llm.model.lower()
+        if not self.enable_prompt_cache or (
+            "claude" not in model and not model.startswith("anthropic")
+        ):
+            return messages
+        if not messages or messages[0].get("role") != "system":
+            return messages
+
+        content = messages[0].get("content")
+        if not isinstance(content, str):
+            return messages
+
+        system_message = {
+            **messages[0],
+            "content": [
+                {
+                    "type": "text",
+                    "text": content,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+        return [system_message, *messages[1:]]
+
+    def _cache_key(self, params: dict[str, Any]) -> bytes:
+        """Build the response cache key for a request.
+
+        Args:
+            params: The completion request parameters
+
+        Returns:
+            A digest of the model, messages and tool settings
+        """
+        payload = json.dumps(
+            {
+                "model": params["model"],
+                "messages": params["messages"],
+                "tools": params.get("tools"),
+                "tool_choice": params.get("tool_choice"),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def clear_cache(self) -> None:
+        """Forget all cached responses."""
+        self._response_cache.clear()
+
+    def close(self) -> None:
+        """Close the pooled HTTP client and release its connections."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
 
     def send_completion(
         self,
@@ -35,6 +222,9 @@ class LLMClient:
     ) -> Any | None:
         """Send a completion request to the LLM API.
 
+        The messages list is passed through as-is and never modified, so
+        callers don't need to copy it before each request.
+
         Args:
             messages: List of conversation messages in chat format
             tools: Optional list of tool definitions
@@ -48,12 +238,18 @@ class LLMClient:
             return None
 
         try:
+            litellm = self._ensure_litellm()
+            if self._completion is None:
+                self._completion = litellm.completion
+
             # Call the model using config
             params: dict[str, Any] = {
                 "model": config.llm.model,
-                "messages": messages,
+                "messages": self._with_prompt_cache(messages),
                 "api_key": self.api_key,
             }
+            if self._uses_anthropic(litellm):
+                params["client"] = self._get_http_client()
 
             # Add optional parameters if specified
             if tools:
@@ -64,8 +260,15 @@ class LLMClient:
                 else:
                     params["tool_choice"] = "auto"
 
+            # Answer repeated requests from the cache
+            cache_key = self._cache_key(params)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return cached
+
             # Call the LLM API
-            response = litellm.completion(**params)
+            response = self._completion(**params)
 
             # Update token counters from response
             self.tokens_sent += response.usage.prompt_tokens
@@ -79,6 +282,11 @@ class LLMClient:
             )
             self.completion_cost += prompt_cost + completion_cost
 
+            # Cache the response, evicting the least recently used if full
+            self._response_cache[cache_key] = response
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
             return response
         except Exception as e:
             display_error(f"API Error: {e}")
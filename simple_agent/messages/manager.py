@@ -1,56 +1,135 @@
 """Message manager for conversation history with automatic persistence."""
 
+import atexit
+import threading
+import time
+import weakref
 from typing import Any
 
+from simple_agent.display import display_warning
 from simple_agent.messages.storage import MessageStorage
 
+# Managers that may have unsaved changes at exit, held weakly so registering
+# one for the exit flush doesn't keep it alive
+_managers: "weakref.WeakSet[MessageManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    """Save pending changes for every manager before the process exits."""
+    for manager in list(_managers):
+        manager.flush()
+
 
 class MessageManager:
-    """Manages conversation messages with automatic persistence to disk."""
+    """Manages conversation messages with automatic persistence to disk.
+
+    Changes are written in the background rather than on every call: a
+    flush thread saves the latest messages shortly after a change, so a turn
+    that adds several messages rewrites the file once. The thread exits once
+    there is nothing left to save, and pending changes are also flushed at
+    exit.
+    """
 
-    def __init__(self, max_messages: int = 50):
+    def __init__(self, max_messages: int = 50, flush_delay: float = 0.25):
         """Initialize message manager.
 
         Args:
             max_messages: Maximum number of messages to store (default: 50)
+            flush_delay: Seconds to wait for more changes before saving
         """
         self.storage = MessageStorage(max_messages=max_messages)
+        self.flush_delay = flush_delay
         self._messages: list[dict[str, Any]] = []
 
+        # Snapshot of the messages waiting to be saved and the thread saving
+        # them, guarded by the lock. Writes happen outside it so changes never
+        # wait on the disk; the write lock keeps snapshots written in order
+        self._pending: list[dict[str, Any]] | None = None
+        self._flush_thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        _managers.add(self)
+
     def load(self) -> None:
         """Load messages from disk."""
+        # Make sure the file reflects any changes still waiting to be saved
+        self.flush()
         self._messages = self.storage.load_messages()
 
+    def _save(self) -> None:
+        """Schedule the current messages to be saved in the background."""
+        with self._lock:
+            # Snapshot the list so later changes can't race the writer
+            self._pending = list(self._messages)
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, daemon=True
+                )
+                self._flush_thread.start()
+
+    def flush(self) -> None:
+        """Save any pending changes to disk now."""
+        with self._write_lock:
+            with self._lock:
+                messages = self._pending
+                self._pending = None
+            if messages is None:
+                return
+
+            try:
+                self.storage.save_messages(messages)
+            except OSError as e:
+                display_warning("Could not save messages.json", e)
+
+    def _flush_loop(self) -> None:
+        """Save pending changes in the background until there are none left."""
+        while True:
+            # Give changes made in quick succession a chance to be saved
+            # together
+            time.sleep(self.flush_delay)
+            try:
+                self.flush()
+            except Exception as e:
+                # Keep saving later changes even if this save failed
+                display_warning("Could not save messages.json", e)
+
+            with self._lock:
+                if self._pending is None:
+                    self._flush_thread = None
+                    return
+
     def append(self, message: dict[str, Any]) -> None:
-        """Append a message and save to disk.
+        """Append a message and schedule a save to disk.
 
         Args:
             message: Message dictionary to append
         """
         self._messages.append(message)
-        self.storage.save_messages(self._messages)
+        self._save()
 
     def extend(self, messages: list[dict[str, Any]]) -> None:
-        """Extend messages list and save to disk.
+        """Extend messages list and schedule a save to disk.
 
         Args:
             messages: List of message dictionaries to append
         """
         self._messages.extend(messages)
-        self.storage.save_messages(self._messages)
+        self._save()
 
     def update_last(self, message: dict[str, Any]) -> None:
-        """Update the last message and save to disk.
+        """Update the last message and schedule a save to disk.
 
         Args:
             message: Message dictionary to replace the last message with
         """
         if self._messages:
             self._messages[-1] = message
-            self.storage.save_messages(self._messages)
+            self._save()
 
     def update_at_index(self, index: int, message: dict[str, Any]) -> None:
-        """Update a message at a specific index and save to disk.
+        """Update a message at a specific index and schedule a save to disk.
 
         Args:
             index: Index of message to update
@@ -58,7 +137,7 @@ class MessageManager:
         """
         if 0 <= index < len(self._messages):
             self._messages[index] = message
-            self.storage.save_messages(self._messages)
+            self._save()
 
     def get_all(self) -> list[dict[str, Any]]:
         """Get all messages.
@@ -80,9 +159,9 @@ class MessageManager:
         return [{"role": "system", "content": system_prompt}] + self._messages
 
     def clear(self) -> None:
-        """Clear all messages and delete from disk."""
+        """Clear all messages and schedule clearing them on disk."""
         self._messages = []
-        self.storage.clear_messages()
+        self._save()
 
     def __len__(self) -> int:
         """Get number of messages.
@@ -104,11 +183,11 @@ class MessageManager:
         return self._messages[index]
 
     def __setitem__(self, index: int, message: dict[str, Any]) -> None:
-        """Set message at index and save to disk.
+        """Set message at index and schedule a save to disk.
 
         Args:
             index: Index of message to update
             message: Message dictionary to set
         """
         self._messages[index] = message
-        self.storage.save_messages(self._messages)
+        self._save()
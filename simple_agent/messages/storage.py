@@ -1,6 +1,9 @@
 """Message persistence for conversation history."""
 
+import contextlib
 import json
+import os
+import tempfile
 from typing import Any
 
 from simple_agent.config import get_config_dir
@@ -28,8 +31,27 @@ class MessageStorage:
 
     def _write_messages(self, messages: list[dict[str, Any]]) -> None:
         """Write messages to disk."""
-        with open(self.storage_path, "w") as f:
-            json.dump(messages, f, indent=2, default=str)
+        # Serialize compactly in one call, which lets json use its C encoder
+        # (indented output always goes through the pure Python one)
+        data = json.dumps(messages, default=str)
+
+        # Write to a uniquely named temporary file, synced to disk, and
+        # rename it over the old one. An interrupted write can't leave a
+        # truncated messages.json behind, and concurrent writers (e.g. two
+        # sessions in one project) don't share a temporary file
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.storage_path.parent, prefix=f".{self.storage_path.name}."
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.storage_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
 
     def save_messages(self, messages: list[dict[str, Any]]) -> None:
         """Save messages to disk, keeping only the most recent ones.
@@ -63,9 +85,8 @@ class MessageStorage:
             return []
 
         try:
-            with open(self.storage_path) as f:
-                messages = json.load(f)
-                return messages if isinstance(messages, list) else []
+            messages = json.loads(self.storage_path.read_bytes())
+            return messages if isinstance(messages, list) else []
         except Exception as e:
             # If file is corrupted or can't be read, show warning and return empty list
             display_warning(
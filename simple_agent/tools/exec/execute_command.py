@@ -1,5 +1,9 @@
 """Tool for executing shell commands."""
 
+import codecs
+import io
+import locale
+import os
 import subprocess
 from select import select
 
@@ -9,6 +13,61 @@ from simple_agent.display import display_command, display_warning, print_tool_ca
 from simple_agent.live_console import console
 from simple_agent.tools.registry import register
 
+# Maximum number of bytes read from a command's output at a time
+READ_SIZE = 65536
+
+
+class _OutputStream:
+    """Decodes one of a command's output pipes and displays it line by line."""
+
+    def __init__(self, capture: list[str], style: str) -> None:
+        """Initialize the stream.
+
+        Args:
+            capture: List the decoded output is appended to
+            style: Rich style the output lines are displayed in
+        """
+        self.capture = capture
+        self.style = style
+
+        # Decode like a text mode pipe: locale encoding with universal
+        # newlines, replacing invalid bytes so binary output can't abort
+        # the command. The incremental decoder handles characters split
+        # across reads
+        self.decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(locale.getpreferredencoding(False))(
+                errors="replace"
+            ),
+            translate=True,
+        )
+
+        # Output after the last newline, shown once its line is complete
+        self.partial_line = ""
+
+    def feed(self, data: bytes) -> None:
+        """Capture and display a chunk of output.
+
+        Args:
+            data: Bytes read from the pipe, empty at end of output
+        """
+        text = self.decoder.decode(data, final=not data)
+        self.capture.append(text)
+
+        lines = (self.partial_line + text).split("\n")
+        self.partial_line = lines.pop()
+        if not data and self.partial_line:
+            lines.append(self.partial_line)
+
+        # Display the output with padding. Lines read in one go are buffered
+        # by the console and written to the terminal together
+        with console:
+            for line in lines:
+                console.print(
+                    Padding(
+                        f"[{self.style}]{line.rstrip()}[/{self.style}]", (0, 0, 0, 2)
+                    )
+                )
+
 
 def execute_command(command: str) -> tuple[str, str, int]:
     """Execute a shell command and return its output.
@@ -25,87 +84,47 @@ def execute_command(command: str) -> tuple[str, str, int]:
     display_command(command)
 
     # For capturing the complete output to return
-    stdout_capture = []
-    stderr_capture = []
+    stdout_capture: list[str] = []
+    stderr_capture: list[str] = []
 
     try:
-        # Run the command directly, without capturing output to show it in real-time
-        process = subprocess.Popen(
+        with subprocess.Popen(
             command,
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            bufsize=0,
-            universal_newlines=True,
+        ) as process:
+            assert process.stdout is not None and process.stderr is not None
+
+            # Output is read straight from the pipes as it arrives. Reading
+            # through a buffered file object would let select miss lines
+            # already sitting in its buffer, holding them back until the
+            # command writes more output or exits
+            streams = {
+                process.stdout.fileno(): _OutputStream(stdout_capture, "dim"),
+                process.stderr.fileno(): _OutputStream(stderr_capture, "red"),
+            }
+            while streams:
+                rlist, _, _ = select(list(streams), [], [])
+                for fd in rlist:
+                    data = os.read(fd, READ_SIZE)
+                    streams[fd].feed(data)
+                    if not data:
+                        del streams[fd]
+
+            return_code = process.wait()
+
+        # Show completion status
+        status = (
+            "[green]✓[/green]"
+            if return_code == 0
+            else f"[red]✗ (code: {return_code})[/red]"
         )
-
-        # Use select to handle stdout and stderr without blocking
-        while True:
-            # Wait for the process to produce output or finish
-            rlist, _, _ = select([process.stdout, process.stderr], [], [], 0.1)
-
-            if process.stdout in rlist and process.stdout is not None:
-                output = process.stdout.readline()
-                if output:
-                    # Capture the output
-                    stdout_capture.append(output)
-
-                    # Display the output with padding
-                    console.print(
-                        Padding(f"[dim]{output.rstrip()}[/dim]", (0, 0, 0, 2))
-                    )
-
-            if process.stderr in rlist and process.stderr is not None:
-                output = process.stderr.readline()
-                if output:
-                    # Capture the error
-                    stderr_capture.append(output)
-
-                    # Display the error with padding
-                    console.print(
-                        Padding(f"[red]{output.rstrip()}[/red]", (0, 0, 0, 2))
-                    )
-
-            # Check if the process has finished
-            if process.poll() is not None:
-                # Read any remaining output
-                if process.stdout is not None:
-                    for output in process.stdout:
-                        # Capture the output
-                        stdout_capture.append(output)
-
-                        # Display with padding
-                        if output.strip():
-                            console.print(
-                                Padding(f"[dim]{output.rstrip()}[/dim]", (0, 0, 0, 2))
-                            )
-
-                if process.stderr is not None:
-                    for output in process.stderr:
-                        # Capture the error
-                        stderr_capture.append(output)
-
-                        # Display with padding
-                        if output.strip():
-                            console.print(
-                                Padding(f"[red]{output.rstrip()}[/red]", (0, 0, 0, 2))
-                            )
-
-                # Show completion status
-                status = (
-                    "[green]✓[/green]"
-                    if process.returncode == 0
-                    else f"[red]✗ (code: {process.returncode})[/red]"
-                )
-                console.print(
-                    Padding(f"[dim]Command completed: {status}[/dim]", (0, 0, 0, 2))
-                )
-
-                break
+        console.print(Padding(f"[dim]Command completed: {status}[/dim]", (0, 0, 0, 2)))
 
         stdout_result = "".join(stdout_capture)
         stderr_result = "".join(stderr_capture)
-        return stdout_result, stderr_result, process.returncode
+        return stdout_result, stderr_result, return_code
     except Exception as e:
         display_warning(f"Failed to execute command: {command}", e)
         return "", str(e), 1
@@ -4,7 +4,12 @@ from unittest.mock import MagicMock
 
 from pytest_mock import MockerFixture
 
-from simple_agent.cli.completion import CommandCompleter, Completer, FilePathCompleter
+from simple_agent.cli.completion import (
+    COMPLETION_CACHE_TTL,
+    CommandCompleter,
+    Completer,
+    FilePathCompleter,
+)
 
 
 def test_command_completer() -> None:
@@ -15,6 +20,7 @@ def test_command_completer() -> None:
     assert "/help" in completer.commands
     assert "/exit" in completer.commands
     assert "/clear" in completer.commands
+    assert "/clear-cache" in completer.commands
     assert "/compress" in completer.commands
     assert "/mcp" in completer.commands
     assert "\\ + Enter" in completer.commands
@@ -25,7 +31,7 @@ def test_command_completer() -> None:
     doc.text_before_cursor = "/"
 
     completions = list(completer.get_completions(doc, MagicMock()))
-    assert len(completions) == 5  # /help, /exit, /clear, /compress, /mcp
+    assert len(completions) == 6  # /help, /exit, /clear, /clear-cache, /compress, /mcp
 
     # Test that slash commands only appear at the beginning of a line
     doc.text_before_cursor = "some text /"
@@ -33,6 +39,42 @@ def test_command_completer() -> None:
     assert len(completions) == 0  # No slash commands in the middle of text
 
 
+def test_command_completer_prefix() -> None:
+    """Test that only commands matching the typed prefix are completed."""
+    completer = CommandCompleter()
+
+    doc = MagicMock()
+    doc.text_before_cursor = "/c"
+    completions = list(completer.get_completions(doc, MagicMock()))
+    assert [c.text for c in completions] == ["/clear", "/clear-cache", "/compress"]
+    assert all(c.start_position == -2 for c in completions)
+
+    doc.text_before_cursor = "/mcp"
+    completions = list(completer.get_completions(doc, MagicMock()))
+    assert [c.text for c in completions] == ["/mcp"]
+
+    doc.text_before_cursor = "/zzz"
+    assert list(completer.get_completions(doc, MagicMock())) == []
+
+
+def test_command_completer_reuses_completions() -> None:
+    """Test that completions are built once per command and prefix length."""
+    completer = CommandCompleter()
+
+    doc = MagicMock()
+    doc.text_before_cursor = "/c"
+    first = list(completer.get_completions(doc, MagicMock()))
+    again = list(completer.get_completions(doc, MagicMock()))
+    assert len(first) == 3
+    assert all(a is b for a, b in zip(first, again, strict=True))
+
+    # A longer prefix gets completions with its own start position
+    doc.text_before_cursor = "/cl"
+    longer = list(completer.get_completions(doc, MagicMock()))
+    assert [c.start_position for c in longer] == [-3, -3]
+    assert first[0].start_position == -2
+
+
 def test_file_path_completer(mocker: MockerFixture) -> None:
     """Test the FilePathCompleter class."""
     completer = FilePathCompleter()
@@ -136,3 +178,55 @@ def test_completer(mocker: MockerFixture) -> None:
 
     completions = list(completer.get_completions(doc, MagicMock()))
     assert len(completions) > 0  # Should yield file completions
+
+
+def test_completer_skips_files_after_command_match(mocker: MockerFixture) -> None:
+    """Test that file completions are not computed when commands matched."""
+    completer = Completer()
+    mock_file_completions = mocker.patch.object(
+        completer.file_completer, "get_completions", return_value=[]
+    )
+
+    doc = MagicMock()
+    doc.text_before_cursor = "/he"
+
+    completions = list(completer.get_completions(doc, MagicMock()))
+    assert [c.text for c in completions] == ["/help"]
+    mock_file_completions.assert_not_called()
+
+
+def test_file_path_completer_ignores_os_errors(mocker: MockerFixture) -> None:
+    """Test that filesystem errors while completing yield no completions."""
+    completer = FilePathCompleter()
+    mocker.patch.object(
+        completer.path_completer,
+        "get_completions",
+        side_effect=OSError("Stale file handle"),
+    )
+
+    doc = MagicMock()
+    doc.text_before_cursor = "~/mnt/share/fi"
+    assert list(completer.get_completions(doc, MagicMock())) == []
+
+
+def test_completer_caches_by_prefix(mocker: MockerFixture) -> None:
+    """Test that completions for a repeated prefix are reused until they expire."""
+    completer = Completer()
+    mock_file_completions = mocker.patch.object(
+        completer.file_completer, "get_completions", return_value=[MagicMock()]
+    )
+    mock_time = mocker.patch("simple_agent.cli.completion.time.monotonic")
+    mock_time.return_value = 100.0
+
+    doc = MagicMock()
+    doc.text_before_cursor = "./te"
+    first = list(completer.get_completions(doc, MagicMock()))
+    second = list(completer.get_completions(doc, MagicMock()))
+
+    assert first == second
+    mock_file_completions.assert_called_once()
+
+    # Once the entry expires the completions are computed again
+    mock_time.return_value = 100.0 + COMPLETION_CACHE_TTL
+    list(completer.get_completions(doc, MagicMock()))
+    assert mock_file_completions.call_count == 2
@@ -0,0 +1,156 @@
+"""Tests for the history module."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.document import Document
+from prompt_toolkit.history import FileHistory, InMemoryHistory
+from pytest_mock import MockerFixture
+
+from simple_agent.cli import history as history_module
+from simple_agent.cli.history import BatchedFileHistory, IndexedAutoSuggest
+
+
+def test_entries_written_on_flush(tmp_path: Path) -> None:
+    """Test that entries are buffered until flushed, in FileHistory's format."""
+    history_file = tmp_path / "history"
+    # Use a long delay so only the explicit flush writes anything
+    history = BatchedFileHistory(str(history_file), flush_delay=60)
+
+    history.store_string("first")
+    history.store_string("second\nline")
+    assert not history_file.exists()
+
+    history.flush()
+
+    # Newest entries come first, and FileHistory can read the file back
+    expected = ["second\nline", "first"]
+    assert list(history.load_history_strings()) == expected
+    assert list(FileHistory(str(history_file)).load_history_strings()) == expected
+
+
+def test_entries_flushed_in_background(tmp_path: Path) -> None:
+    """Test that the background thread writes pending entries."""
+    history_file = tmp_path / "history"
+    history = BatchedFileHistory(str(history_file), flush_delay=0.01)
+
+    history.store_string("command")
+
+    deadline = time.monotonic() + 5
+    while not history_file.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert list(history.load_history_strings()) == ["command"]
+
+
+def test_flush_ignores_write_errors(tmp_path: Path) -> None:
+    """Test that an unwritable history file doesn't raise."""
+    history = BatchedFileHistory(str(tmp_path / "missing" / "history"), flush_delay=60)
+
+    history.store_string("command")
+    history.flush()
+
+    assert list(history.load_history_strings()) == []
+
+
+def test_store_not_blocked_by_slow_write(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that storing an entry doesn't wait for a batch being written."""
+    history = BatchedFileHistory(str(tmp_path / "history"), flush_delay=60)
+    writing = threading.Event()
+    release = threading.Event()
+    real_open = open
+
+    def slow_open(*args: Any, **kwargs: Any) -> Any:
+        writing.set()
+        release.wait(5)
+        return real_open(*args, **kwargs)
+
+    mocker.patch("simple_agent.cli.history.open", side_effect=slow_open, create=True)
+    history.store_string("first")
+    flusher = threading.Thread(target=history.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    # Storing another entry returns while the first batch is still writing
+    start = time.monotonic()
+    history.store_string("second")
+    assert time.monotonic() - start < 1
+
+    release.set()
+    flusher.join()
+    history.flush()
+    assert list(history.load_history_strings()) == ["second", "first"]
+
+
+def test_load_matches_file_history(tmp_path: Path) -> None:
+    """Test that loading parses files written by FileHistory."""
+    history_file = tmp_path / "history"
+    file_history = FileHistory(str(history_file))
+    for entry in ["one", "two\nlines", "", "three"]:
+        file_history.store_string(entry)
+
+    history = BatchedFileHistory(str(history_file))
+
+    assert list(history.load_history_strings()) == list(
+        FileHistory(str(history_file)).load_history_strings()
+    )
+
+
+def test_load_reads_only_recent_entries(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that loading is bounded by file tail size and entry count."""
+    history_file = tmp_path / "history"
+    file_history = FileHistory(str(history_file))
+    for i in range(100):
+        file_history.store_string(f"command {i}\nsecond line")
+
+    history = BatchedFileHistory(str(history_file))
+
+    # The seek lands mid-file and the cut entry is dropped
+    mocker.patch.object(history_module, "HISTORY_TAIL_BYTES", 500)
+    entries = list(history.load_history_strings())
+    assert 0 < len(entries) < 100
+    assert entries[0] == "command 99\nsecond line"
+    assert all(entry.endswith("\nsecond line") for entry in entries)
+
+    # Only the newest entries are kept
+    mocker.patch.object(history_module, "MAX_HISTORY_ENTRIES", 3)
+    assert list(history.load_history_strings()) == [
+        "command 99\nsecond line",
+        "command 98\nsecond line",
+        "command 97\nsecond line",
+    ]
+
+
+def test_indexed_auto_suggest_matches_history_suggestions() -> None:
+    """Test that suggestions match prompt_toolkit's history auto-suggest."""
+    history = InMemoryHistory()
+    for entry in ["git status", "git commit -m 'x'", "ls\ngit log", "grep foo"]:
+        history.append_string(entry)
+    buffer = Buffer(history=history)
+
+    suggester = IndexedAutoSuggest()
+    reference = AutoSuggestFromHistory()
+
+    for text in ["g", "git", "git c", "gr", "ls", "first\ngit s", "x", " ", ""]:
+        document = Document(text)
+        expected = reference.get_suggestion(buffer, document)
+        suggestion = suggester.get_suggestion(buffer, document)
+        assert (suggestion and suggestion.text) == (expected and expected.text)
+
+
+def test_indexed_auto_suggest_picks_up_new_entries() -> None:
+    """Test that the index is rebuilt when the history grows."""
+    history = InMemoryHistory()
+    history.append_string("make test")
+    buffer = Buffer(history=history)
+    suggester = IndexedAutoSuggest()
+
+    suggestion = suggester.get_suggestion(buffer, Document("make"))
+    assert suggestion is not None and suggestion.text == " test"
+
+    history.append_string("make lint")
+    suggestion = suggester.get_suggestion(buffer, Document("make"))
+    assert suggestion is not None and suggestion.text == " lint"
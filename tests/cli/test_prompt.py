@@ -1,16 +1,24 @@
 """Tests for the prompt module."""
 
+from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.document import Document
+from prompt_toolkit.history import ThreadedHistory
 from prompt_toolkit.keys import Keys
 from pytest_mock import MockerFixture
 
+from simple_agent.cli.history import BatchedFileHistory
 from simple_agent.cli.prompt import (
     CLI,
+    SHELL_OUTPUT_LIMIT,
     CLIMode,
+    prompt_continuation,
     setup_keybindings,
+    truncate_output,
 )
 
 
@@ -32,9 +40,9 @@ def test_cli_init(cli_instance: CLI) -> None:
 
 def test_cli_init_history_fallback(mocker: MockerFixture) -> None:
     """Test CLI initialization with history file fallback."""
-    # Mock FileHistory to raise an exception
-    mock_file_history = mocker.patch("simple_agent.cli.prompt.FileHistory")
-    mock_file_history.side_effect = Exception("Cannot create history file")
+    # Pretend the home directory doesn't exist
+    mocker.patch("simple_agent.cli.prompt.os.path.isdir", return_value=False)
+    mock_file_history = mocker.patch("simple_agent.cli.prompt.BatchedFileHistory")
 
     # Mock process_input callback
     mock_process_input = mocker.MagicMock()
@@ -48,6 +56,23 @@ def test_cli_init_history_fallback(mocker: MockerFixture) -> None:
     assert hasattr(cli, "session")
     # Note: console is now imported from display module, not an attribute of CLI
 
+    # History is skipped rather than pointed at a missing directory
+    mock_file_history.assert_not_called()
+    assert cli.session.history is not None  # PromptSession's in-memory default
+
+
+def test_session_created_lazily(mocker: MockerFixture) -> None:
+    """Test that the prompt session is only built when first needed."""
+    mock_session_class = mocker.patch("simple_agent.cli.prompt.PromptSession")
+
+    cli = CLI(process_input_callback=mocker.MagicMock())
+    mock_session_class.assert_not_called()
+
+    # First access builds the session, later accesses reuse it
+    assert cli.session is mock_session_class.return_value
+    assert cli.session is mock_session_class.return_value
+    mock_session_class.assert_called_once()
+
 
 def test_show_help(cli_instance: CLI, mocker: MockerFixture) -> None:
     """Test the show_help method."""
@@ -96,6 +121,27 @@ def test_run_interactive_loop(cli_instance: CLI, mocker: MockerFixture) -> None:
     mock_show_help.assert_called_once()
 
 
+def test_run_interactive_loop_command_dispatch(
+    cli_instance: CLI, mocker: MockerFixture
+) -> None:
+    """Test that slash commands are matched case-insensitively on the first word."""
+    mocker.patch("simple_agent.display.console.print")
+    mock_warning = mocker.patch("simple_agent.cli.prompt.display_warning")
+    cli_instance.session.prompt = MagicMock(  # type: ignore
+        side_effect=["/HELP", "/compress keep decisions", "/unknown", "/Exit"]
+    )
+    mock_show_help = mocker.MagicMock()
+    cli_instance.show_help = mock_show_help  # type: ignore
+    mock_process_input = mocker.MagicMock()
+    cli_instance.process_input = mock_process_input  # type: ignore
+
+    cli_instance.run_interactive_loop()
+
+    mock_show_help.assert_called_once()
+    mock_process_input.assert_called_once_with("__COMPRESS__keep decisions")
+    mock_warning.assert_called_once_with("Unknown command: /unknown")
+
+
 def test_run_interactive_loop_keyboard_interrupt(
     cli_instance: CLI, mocker: MockerFixture
 ) -> None:
@@ -379,20 +425,22 @@ def test_enter_handler(cli_instance: CLI, mocker: MockerFixture) -> None:
 
     assert enter_handler is not None
 
-    # Test Enter handler with backslash continuation
-    mock_buffer.document.current_line = "test line \\"
+    # Test Enter handler with backslash continuation, using a real buffer
+    buffer = Buffer(multiline=True)
+    buffer.document = Document("  first\n  test line \\ rest", 21)
+    mock_event.app.current_buffer = buffer
     cli_instance.mode = CLIMode.NORMAL
-    mock_buffer.reset_mock()
 
     enter_handler(mock_event)
 
-    # Should delete the backslash
-    mock_buffer.delete_before_cursor.assert_called_once_with(1)
-    # Should insert a newline
-    mock_buffer.newline.assert_called_once()
+    # Should replace the backslash with an indented newline in one edit
+    assert buffer.text == "  first\n  test line \n   rest"
+    assert buffer.cursor_position == len("  first\n  test line \n  ")
+    mock_event.app.current_buffer = mock_buffer
 
     # Test Enter handler with backslash continuation in shell mode
-    mock_buffer.document.current_line = "echo foo \\"
+    mock_buffer.text = "echo foo \\"
+    mock_buffer.cursor_position = len(mock_buffer.text)
     cli_instance.mode = CLIMode.SHELL
     mock_buffer.reset_mock()
 
@@ -404,7 +452,8 @@ def test_enter_handler(cli_instance: CLI, mocker: MockerFixture) -> None:
     mock_buffer.newline.assert_called_once()
 
     # Test normal Enter behavior (no backslash)
-    mock_buffer.document.current_line = "normal line"
+    mock_buffer.text = "normal line"
+    mock_buffer.cursor_position = len(mock_buffer.text)
     mock_buffer.reset_mock()
 
     enter_handler(mock_event)
@@ -412,6 +461,15 @@ def test_enter_handler(cli_instance: CLI, mocker: MockerFixture) -> None:
     # Should validate and handle
     mock_buffer.validate_and_handle.assert_called_once()
 
+    # Test Enter on empty input
+    mock_buffer.text = ""
+    mock_buffer.cursor_position = 0
+    mock_buffer.reset_mock()
+
+    enter_handler(mock_event)
+
+    mock_buffer.validate_and_handle.assert_called_once()
+
 
 def test_run_interactive_loop_eof(cli_instance: CLI, mocker: MockerFixture) -> None:
     """Test handling of EOFError in run_interactive_loop."""
@@ -522,6 +580,16 @@ def test_shell_mode_in_interactive_loop(
     assert "Output:" in args
 
 
+def test_truncate_output() -> None:
+    """Test that long command output keeps only its end."""
+    assert truncate_output("short") == "short"
+
+    output = "x" * 10 + "y" * SHELL_OUTPUT_LIMIT
+    assert truncate_output(output) == (
+        "[... 10 characters omitted ...]\n" + "y" * SHELL_OUTPUT_LIMIT
+    )
+
+
 def test_clear_command_clears_messages(mocker: MockerFixture) -> None:
     """Test that /clear command clears message history if message manager is provided."""
     # Create a mock message manager
@@ -654,6 +722,23 @@ def test_show_mcp_servers_with_failed_server(mocker: MockerFixture) -> None:
     assert any("failed to load" in arg for arg in call_args_list)
 
 
+def test_show_mcp_servers_without_manager(mocker: MockerFixture) -> None:
+    """Test show_mcp_servers when servers are configured but none were started."""
+    cli = CLI(process_input_callback=mocker.MagicMock(), mcp_manager=None)
+
+    mocker.patch(
+        "simple_agent.cli.prompt.config.mcp_servers",
+        {"test-server": mocker.MagicMock()},
+    )
+    mocker.patch("simple_agent.cli.prompt.config.mcp_disabled", False)
+    mock_print = mocker.patch("simple_agent.display.console.print")
+
+    cli.show_mcp_servers()
+
+    call_args = str(mock_print.call_args_list)
+    assert "test-server - [red]not running[/red]" in call_args
+
+
 def test_mcp_command_in_interactive_loop(mocker: MockerFixture) -> None:
     """Test /mcp command handling in interactive loop."""
     mock_process_input = mocker.MagicMock()
@@ -673,3 +758,73 @@ def test_mcp_command_in_interactive_loop(mocker: MockerFixture) -> None:
 
     # Verify show_mcp_servers was called
     mock_show_mcp.assert_called_once()
+
+
+def test_history_loaded_in_background(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that the file history is wrapped to load in a background thread."""
+    history_file = str(tmp_path / ".simple_agent_history")
+    mocker.patch("simple_agent.cli.prompt.HISTORY_FILE", history_file)
+    mock_session_class = mocker.patch("simple_agent.cli.prompt.PromptSession")
+
+    cli = CLI(process_input_callback=mocker.MagicMock())
+    cli._get_session()
+
+    history = mock_session_class.call_args[1]["history"]
+    assert isinstance(history, ThreadedHistory)
+    assert isinstance(history.history, BatchedFileHistory)
+    assert history.history.filename == history_file
+
+
+def test_session_features_follow_terminal(mocker: MockerFixture) -> None:
+    """Test that typing-time completion and mouse support need a terminal."""
+    mock_session_class = mocker.patch("simple_agent.cli.prompt.PromptSession")
+    mocker.patch("simple_agent.cli.prompt.sys.stdout.isatty", return_value=True)
+
+    mocker.patch("simple_agent.cli.prompt.sys.stdin.isatty", return_value=True)
+    CLI(process_input_callback=mocker.MagicMock())._get_session()
+    kwargs = mock_session_class.call_args[1]
+    assert kwargs["complete_while_typing"] is True
+    assert kwargs["complete_in_thread"] is True
+    assert kwargs["mouse_support"] is True
+
+    mocker.patch("simple_agent.cli.prompt.sys.stdin.isatty", return_value=False)
+    CLI(process_input_callback=mocker.MagicMock())._get_session()
+    kwargs = mock_session_class.call_args[1]
+    assert kwargs["complete_while_typing"] is False
+    assert kwargs["complete_in_thread"] is False
+    assert kwargs["mouse_support"] is False
+
+
+def test_clear_cache_command(mocker: MockerFixture) -> None:
+    """Test that /clear-cache clears the LLM client's response cache."""
+    mocker.patch("simple_agent.display.console.print")
+    mock_llm_client = mocker.MagicMock()
+    cli = CLI(process_input_callback=mocker.MagicMock(), llm_client=mock_llm_client)
+    cli.session.prompt = mocker.MagicMock(side_effect=["/clear-cache", "/exit"])  # type: ignore
+
+    cli.run_interactive_loop()
+
+    mock_llm_client.clear_cache.assert_called_once()
+
+
+def test_clear_command_clears_response_cache(mocker: MockerFixture) -> None:
+    """Test that /clear also forgets cached responses."""
+    mocker.patch("simple_agent.display.console.print")
+    mocker.patch("simple_agent.cli.prompt.clear")
+    mock_llm_client = mocker.MagicMock()
+    cli = CLI(
+        process_input_callback=mocker.MagicMock(),
+        message_manager=mocker.MagicMock(),
+        llm_client=mock_llm_client,
+    )
+    cli.session.prompt = mocker.MagicMock(side_effect=["/clear", "/exit"])  # type: ignore
+
+    cli.run_interactive_loop()
+
+    mock_llm_client.clear_cache.assert_called_once()
+
+
+def test_prompt_continuation() -> None:
+    """Test that only new lines, not wrapped ones, are indented."""
+    assert prompt_continuation(2, 1, False) == "  "
+    assert prompt_continuation(2, 1, True) == ""
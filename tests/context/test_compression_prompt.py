@@ -1,6 +1,7 @@
 """Tests for compression prompt."""
 
 from simple_agent.context.compression_prompt import (
+    COMPRESSION_SYSTEM_PROMPT,
     _format_conversation,
     get_compression_prompt,
 )
@@ -38,6 +39,22 @@ def test_get_compression_prompt() -> None:
     assert user_content == "user"
 
 
+def test_get_compression_prompt_matches_template() -> None:
+    """Test that the system prompt fills the template like str.format."""
+    prompt_messages = get_compression_prompt([], user_instructions="Keep {braces}")
+
+    today = (
+        prompt_messages[0]["content"].split("\n", 1)[0].removeprefix("Today's date: ")
+    )
+    assert prompt_messages[0]["content"] == COMPRESSION_SYSTEM_PROMPT.format(
+        today=today, user_instructions="Keep {braces}"
+    )
+
+    # Without instructions a default is filled in
+    prompt_messages = get_compression_prompt([])
+    assert "No specific instructions provided." in prompt_messages[0]["content"]
+
+
 def test_format_conversation() -> None:
     """Test formatting conversation for review."""
     messages: list[dict] = [
@@ -0,0 +1,33 @@
+"""Tests for the context loader."""
+
+from pathlib import Path
+
+from simple_agent.context.loader import load_context_from_directory
+
+
+def test_load_context_from_directory(tmp_path: Path) -> None:
+    """Test that markdown files are combined in name order."""
+    (tmp_path / "b.md").write_text("Second\n")
+    (tmp_path / "a.md").write_text("  First  ")
+    (tmp_path / "empty.md").write_text("\n")
+    (tmp_path / "notes.txt").write_text("Ignored")
+
+    assert load_context_from_directory(tmp_path) == (
+        "# Context from a.md\n\nFirst\n\n---\n\n# Context from b.md\n\nSecond"
+    )
+
+
+def test_load_context_from_missing_directory(tmp_path: Path) -> None:
+    """Test that a missing directory gives no context."""
+    assert load_context_from_directory(tmp_path / "missing") == ""
+
+
+def test_load_context_skips_unreadable_files(tmp_path: Path) -> None:
+    """Test that a file that can't be read is skipped."""
+    (tmp_path / "a.md").write_text("First")
+    (tmp_path / "b.md").mkdir()
+    (tmp_path / "c.md").write_text("Third")
+
+    assert load_context_from_directory(tmp_path) == (
+        "# Context from a.md\n\nFirst\n\n---\n\n# Context from c.md\n\nThird"
+    )
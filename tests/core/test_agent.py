@@ -1,6 +1,7 @@
 """Tests for the agent module."""
 
 import contextlib
+import sys
 from pathlib import Path
 
 import pytest
@@ -11,9 +12,11 @@ from simple_agent.core.agent import Agent
 
 
 @pytest.fixture
-def agent(tmp_path: Path) -> Agent:
+def agent(tmp_path: Path, mocker: MockerFixture) -> Agent:
     """Create an agent for testing with isolated message storage."""
     agent = Agent()
+    # Don't load LiteLLM or connect to the API in the background
+    mocker.patch.object(agent.llm_client, "prewarm")
     # Use temporary storage path for tests to avoid interference
     agent.messages.storage.storage_path = tmp_path / "messages.json"
     agent.messages.storage._ensure_storage_exists()
@@ -34,7 +37,7 @@ def test_agent_init(agent: Agent) -> None:
 def test_agent_input_handler(agent: Agent, mocker: MockerFixture) -> None:
     """Test that the agent properly sets up the input handler."""
     # Mock CLI class to avoid actual CLI initialization
-    mock_cli = mocker.patch("simple_agent.cli.prompt.CLI")
+    mock_cli = mocker.patch("simple_agent.core.agent.CLI")
 
     # Create a mock input function
     mock_input = mocker.MagicMock()
@@ -53,6 +56,28 @@ def test_agent_input_handler(agent: Agent, mocker: MockerFixture) -> None:
     assert agent.tool_handler.input_func == mock_input
 
 
+def test_on_start_prewarms_in_background(agent: Agent, mocker: MockerFixture) -> None:
+    """Test that startup work is handed to background threads."""
+    mock_thread = mocker.patch("simple_agent.core.agent.threading.Thread")
+    mock_display = mocker.patch.object(agent, "_display_loaded_messages")
+
+    agent._on_start()
+
+    agent.llm_client.prewarm.assert_called_once_with()  # type: ignore[attr-defined]
+    mock_thread.assert_called_once_with(target=agent._prewarm_imports, daemon=True)
+    mock_thread.return_value.start.assert_called_once_with()
+    mock_display.assert_called_once_with()
+
+
+def test_prewarm_imports(agent: Agent, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that deferred modules are imported ahead of the first response."""
+    monkeypatch.delitem(sys.modules, "rich.markdown", raising=False)
+
+    agent._prewarm_imports()
+
+    assert "rich.markdown" in sys.modules
+
+
 def test_process_input_ai_request(agent: Agent, mocker: MockerFixture) -> None:
     """Test the _process_input method with AI request."""
     # Mock the AI handler method
@@ -639,3 +664,29 @@ def test_load_mcp_tools_server_error(tmp_path: Path, mocker: MockerFixture) -> N
 
     # Verify discover_and_register was NOT called due to error
     mock_adapter.discover_and_register_tools_sync.assert_not_called()
+
+
+def test_compression_retry_not_served_from_cache(
+    agent: Agent, mocker: MockerFixture
+) -> None:
+    """Test that re-running /compress asks the model again."""
+    mocker.patch("simple_agent.core.agent.live_context")
+    mocker.patch("simple_agent.core.agent.display_info")
+    agent.llm_client.api_key = "test_key"
+    agent.messages.append({"role": "user", "content": "Hello"})
+
+    # The first run is interrupted while applying the model's file edits
+    response = mocker.MagicMock()
+    response.choices[0].message.content = None
+    response.choices[0].message.tool_calls = [mocker.MagicMock()]
+    mock_completion = mocker.patch("litellm.completion", return_value=response)
+    mock_tool_handler = mocker.MagicMock()
+    mock_tool_handler.process_tool_calls.side_effect = KeyboardInterrupt()
+    agent.tool_handler = mock_tool_handler
+    with pytest.raises(KeyboardInterrupt):
+        agent._handle_compression()
+
+    # The same request on the retry goes to the model instead of the cache
+    with pytest.raises(KeyboardInterrupt):
+        agent._handle_compression()
+    assert mock_completion.call_count == 2
@@ -1,5 +1,7 @@
 """Tests for the LLM client module."""
 
+import ssl
+
 import pytest
 from pytest_mock import MockerFixture
 
@@ -195,3 +197,217 @@ def test_cost_calculation(client: LLMClient, mocker: MockerFixture) -> None:
     assert client.tokens_sent == 100
     assert client.tokens_received == 50
     assert client.completion_cost == 0.0025  # 0.001 + 0.0015
+
+
+def test_litellm_imported_lazily(mocker: MockerFixture) -> None:
+    """Test that LiteLLM is only imported when a request is sent."""
+    mocker.patch.object(LLMClient, "_litellm", None)
+    mocker.patch.dict("sys.modules", {"litellm": None})
+
+    # Creating a client must not import litellm
+    client = LLMClient(api_key="test_key")
+    assert LLMClient._litellm is None
+
+    # The first request triggers the import (which fails here) and reports it
+    mock_display_error = mocker.patch("simple_agent.llm.client.display_error")
+    assert client.send_completion([{"role": "user", "content": "hi"}]) is None
+    mock_display_error.assert_called_once()
+
+
+def test_send_completion_does_not_modify_messages(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that the caller's message list is left untouched."""
+    mock_completion = mocker.patch("litellm.completion")
+
+    messages = [{"role": "user", "content": "test message"}]
+    client.send_completion(messages)
+    client.clear_cache()
+    client.send_completion(messages)
+
+    assert messages == [{"role": "user", "content": "test message"}]
+    assert mock_completion.call_count == 2
+
+
+def test_http_client_reused_for_anthropic(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that Anthropic requests share one pooled HTTP client."""
+    mocker.patch.object(config.llm, "model", "claude-3-5-sonnet-20241022")
+    mock_completion = mocker.patch("litellm.completion")
+
+    client.send_completion([{"role": "user", "content": "one"}])
+    client.send_completion([{"role": "user", "content": "two"}])
+
+    first, second = (c[1]["client"] for c in mock_completion.call_args_list)
+    assert first is second
+    assert first is client._http_client
+
+    client.close()
+    assert client._http_client is None
+
+
+def test_http_client_uses_litellm_ssl_settings(
+    client: LLMClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the pooled client is built with LiteLLM's SSL configuration."""
+    monkeypatch.setenv("SSL_VERIFY", "False")
+
+    http_client = client._get_http_client()
+
+    # LiteLLM created the httpx client, so SSL_VERIFY turned off verification
+    pool = http_client.client._transport._pool
+    assert pool._ssl_context.verify_mode == ssl.CERT_NONE
+    client.close()
+
+
+def test_http_client_not_passed_to_other_providers(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that non-Anthropic models use LiteLLM's own client."""
+    mocker.patch.object(config.llm, "model", "gpt-4o")
+    mock_completion = mocker.patch("litellm.completion")
+
+    client.send_completion([{"role": "user", "content": "test message"}])
+
+    assert "client" not in mock_completion.call_args[1]
+    assert client._http_client is None
+
+
+def test_prewarm_connects_pooled_client(
+    client: LLMClient, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that prewarming loads LiteLLM and opens a pooled connection."""
+    monkeypatch.delenv("ANTHROPIC_API_BASE", raising=False)
+    monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
+    mocker.patch.object(config.llm, "model", "claude-3-5-sonnet-20241022")
+    mock_http_client = mocker.MagicMock()
+    mocker.patch.object(client, "_get_http_client", return_value=mock_http_client)
+
+    # Run the thread target inline so the test is deterministic
+    mock_thread = mocker.patch("simple_agent.llm.client.threading.Thread")
+    client.prewarm()
+    mock_thread.assert_called_once_with(target=client._prewarm, daemon=True)
+    client._prewarm()
+
+    assert client._completion is not None
+    mock_http_client.client.head.assert_called_once_with(
+        "https://api.anthropic.com/", timeout=5.0
+    )
+
+
+def test_prewarm_uses_configured_base_url(
+    client: LLMClient, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that prewarming connects to the base URL requests will use."""
+    mocker.patch.object(config.llm, "model", "claude-3-5-sonnet-20241022")
+    mock_http_client = mocker.MagicMock()
+    mocker.patch.object(client, "_get_http_client", return_value=mock_http_client)
+    monkeypatch.delenv("ANTHROPIC_API_BASE", raising=False)
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", "https://gateway.example.com")
+
+    client._prewarm()
+
+    mock_http_client.client.head.assert_called_once_with(
+        "https://gateway.example.com", timeout=5.0
+    )
+
+
+def test_prewarm_without_api_key(mocker: MockerFixture) -> None:
+    """Test that LiteLLM is still loaded but no connection is opened."""
+    mocker.patch.object(config.llm, "api_key", None)
+    client = LLMClient()
+    mock_get_http_client = mocker.patch.object(client, "_get_http_client")
+
+    client._prewarm()
+
+    assert client._completion is not None
+    mock_get_http_client.assert_not_called()
+
+
+def test_repeated_request_served_from_cache(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that identical requests only call the API once."""
+    mock_response = mocker.MagicMock()
+    mock_response.usage.prompt_tokens = 10
+    mock_response.usage.completion_tokens = 5
+    mock_completion = mocker.patch("litellm.completion", return_value=mock_response)
+    mocker.patch("litellm.cost_per_token", return_value=(0.0, 0.0))
+
+    first = client.send_completion([{"role": "user", "content": "same"}])
+    second = client.send_completion([{"role": "user", "content": "same"}])
+
+    assert first is second is mock_response
+    mock_completion.assert_called_once()
+    # Cached answers don't count towards token usage
+    assert client.tokens_sent == 10
+
+    # A different request still goes to the API
+    client.send_completion([{"role": "user", "content": "different"}])
+    assert mock_completion.call_count == 2
+
+    # Clearing the cache forces a fresh request
+    client.clear_cache()
+    client.send_completion([{"role": "user", "content": "same"}])
+    assert mock_completion.call_count == 3
+
+
+def test_response_cache_evicts_least_recently_used(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that the response cache is bounded."""
+    mocker.patch("simple_agent.llm.client.RESPONSE_CACHE_SIZE", 2)
+    mock_completion = mocker.patch("litellm.completion")
+
+    for content in ("a", "b", "a", "c", "a", "b"):
+        client.send_completion([{"role": "user", "content": content}])
+
+    # "b" was evicted when "c" was added, while "a" stayed recently used
+    assert mock_completion.call_count == 4
+    assert len(client._response_cache) == 2
+
+
+def test_system_prompt_marked_for_prompt_cache(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that Claude requests tag the system prompt without changing the input."""
+    mocker.patch.object(config.llm, "model", "claude-3-5-sonnet-20241022")
+    mock_completion = mocker.patch("litellm.completion")
+
+    messages = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "test message"},
+    ]
+    client.send_completion(messages)
+
+    sent = mock_completion.call_args[1]["messages"]
+    assert sent[0]["content"] == [
+        {
+            "type": "text",
+            "text": "system prompt",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert sent[1] is messages[1]
+    assert messages[0] == {"role": "system", "content": "system prompt"}
+
+
+def test_prompt_cache_skipped_for_other_models(
+    client: LLMClient, mocker: MockerFixture
+) -> None:
+    """Test that non-Claude models and a disabled flag send messages as-is."""
+    mock_completion = mocker.patch("litellm.completion")
+    messages = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "test message"},
+    ]
+
+    mocker.patch.object(config.llm, "model", "gpt-4o")
+    client.send_completion(messages)
+    assert mock_completion.call_args[1]["messages"] is messages
+
+    mocker.patch.object(config.llm, "model", "claude-3-5-sonnet-20241022")
+    client.enable_prompt_cache = False
+    client.send_completion(messages)
+    assert mock_completion.call_args[1]["messages"] is messages
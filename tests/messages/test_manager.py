@@ -1,8 +1,14 @@
 """Tests for message manager."""
 
+import gc
+import json
+import threading
+import time
+import weakref
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
 from simple_agent.messages.manager import MessageManager
 
@@ -42,6 +48,7 @@ def test_append_auto_saves(manager: MessageManager, temp_storage_path: Path) ->
     manager.append({"role": "user", "content": "Hello"})
 
     # Create new manager and load
+    manager.flush()
     new_manager = MessageManager(max_messages=5)
     new_manager.storage.storage_path = temp_storage_path
     new_manager.load()
@@ -74,6 +81,7 @@ def test_extend_auto_saves(manager: MessageManager, temp_storage_path: Path) ->
     manager.extend(messages)
 
     # Create new manager and load
+    manager.flush()
     new_manager = MessageManager(max_messages=5)
     new_manager.storage.storage_path = temp_storage_path
     new_manager.load()
@@ -150,6 +158,7 @@ def test_clear(manager: MessageManager, temp_storage_path: Path) -> None:
     assert len(manager) == 0
 
     # Verify disk is also cleared
+    manager.flush()
     new_manager = MessageManager(max_messages=5)
     new_manager.storage.storage_path = temp_storage_path
     new_manager.load()
@@ -186,6 +195,7 @@ def test_setitem(manager: MessageManager, temp_storage_path: Path) -> None:
     assert manager[0]["content"] == "Updated"
 
     # Verify it saved
+    manager.flush()
     new_manager = MessageManager(max_messages=5)
     new_manager.storage.storage_path = temp_storage_path
     new_manager.load()
@@ -202,6 +212,7 @@ def test_load_preserves_order(manager: MessageManager, temp_storage_path: Path)
 
     manager.extend(messages)
 
+    manager.flush()
     new_manager = MessageManager(max_messages=5)
     new_manager.storage.storage_path = temp_storage_path
     new_manager.load()
@@ -217,6 +228,7 @@ def test_max_messages_limit(manager: MessageManager, temp_storage_path: Path) ->
         manager.append({"role": "user", "content": f"Message {i}"})
 
     # Load in new manager - should only have last 5
+    manager.flush()
     new_manager = MessageManager(max_messages=5)
     new_manager.storage.storage_path = temp_storage_path
     new_manager.load()
@@ -224,3 +236,110 @@ def test_max_messages_limit(manager: MessageManager, temp_storage_path: Path) ->
     assert len(new_manager) == 5
     assert new_manager[0]["content"] == "Message 5"
     assert new_manager[-1]["content"] == "Message 9"
+
+
+def test_changes_saved_in_background(temp_storage_path: Path) -> None:
+    """Test that changes reach the disk without an explicit flush."""
+    manager = MessageManager(max_messages=5, flush_delay=0.01)
+    manager.storage.storage_path = temp_storage_path
+    manager.storage._ensure_storage_exists()
+
+    manager.append({"role": "user", "content": "Hello"})
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if json.loads(temp_storage_path.read_text()):
+            break
+        time.sleep(0.01)
+    assert json.loads(temp_storage_path.read_text()) == [
+        {"role": "user", "content": "Hello"}
+    ]
+
+
+def test_changes_saved_together(manager: MessageManager, mocker: MockerFixture) -> None:
+    """Test that several changes before a flush are written once."""
+    # Keep the background thread from flushing first
+    manager.flush_delay = 60
+    save_messages = mocker.spy(manager.storage, "save_messages")
+
+    manager.append({"role": "user", "content": "Question"})
+    manager.append({"role": "assistant", "content": "Answer"})
+    manager.update_last({"role": "assistant", "content": "Better answer"})
+    manager.flush()
+    manager.flush()
+
+    save_messages.assert_called_once_with(
+        [
+            {"role": "user", "content": "Question"},
+            {"role": "assistant", "content": "Better answer"},
+        ]
+    )
+
+
+def test_changes_not_blocked_by_slow_save(
+    manager: MessageManager, mocker: MockerFixture
+) -> None:
+    """Test that changes don't wait for a save already writing to disk."""
+    manager.flush_delay = 60
+    writing = threading.Event()
+    release = threading.Event()
+
+    def slow_save(messages: list[dict]) -> None:
+        writing.set()
+        release.wait(5)
+
+    mocker.patch.object(manager.storage, "save_messages", side_effect=slow_save)
+    manager.append({"role": "user", "content": "First"})
+    flusher = threading.Thread(target=manager.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    # Scheduling another save returns while the first is still writing
+    start = time.monotonic()
+    manager.append({"role": "user", "content": "Second"})
+    assert time.monotonic() - start < 1
+
+    release.set()
+    flusher.join()
+
+
+def test_background_save_survives_errors(
+    temp_storage_path: Path, mocker: MockerFixture
+) -> None:
+    """Test that an unexpected save error doesn't stop later saves."""
+    mocker.patch("simple_agent.messages.manager.display_warning")
+    manager = MessageManager(max_messages=5, flush_delay=0.01)
+    manager.storage.storage_path = temp_storage_path
+    manager.storage._ensure_storage_exists()
+    save_messages = mocker.patch.object(
+        manager.storage, "save_messages", side_effect=[ValueError("bad"), None]
+    )
+
+    manager.append({"role": "user", "content": "First"})
+    deadline = time.monotonic() + 5
+    while save_messages.call_count < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    manager.append({"role": "user", "content": "Second"})
+    while save_messages.call_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert save_messages.call_count == 2
+    assert save_messages.call_args[0][0][-1]["content"] == "Second"
+
+
+def test_manager_not_kept_alive_for_exit(temp_storage_path: Path) -> None:
+    """Test that the exit flush doesn't keep a manager alive."""
+    manager = MessageManager(max_messages=5, flush_delay=0.01)
+    manager.storage.storage_path = temp_storage_path
+    manager.storage._ensure_storage_exists()
+    manager.append({"role": "user", "content": "Hello"})
+    manager.flush()
+    manager_ref = weakref.ref(manager)
+    del manager
+
+    # Wait for the idle flush thread to exit and drop its reference
+    deadline = time.monotonic() + 5
+    while manager_ref() is not None and time.monotonic() < deadline:
+        gc.collect()
+        time.sleep(0.01)
+    assert manager_ref() is None
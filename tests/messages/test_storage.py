@@ -1,8 +1,10 @@
 """Tests for message storage."""
 
+import threading
 from pathlib import Path
 
 import pytest
+from pytest_mock import MockerFixture
 
 from simple_agent.messages.storage import MessageStorage
 
@@ -138,3 +140,51 @@ def test_multiple_save_operations(storage: MessageStorage) -> None:
     loaded2 = storage.load_messages()
     assert len(loaded2) == 2
     assert loaded2[0]["content"] == "Second"
+
+
+def test_interrupted_save_keeps_messages(
+    storage: MessageStorage, mocker: MockerFixture
+) -> None:
+    """Test that a failed write leaves the previous messages intact."""
+    storage.save_messages([{"role": "user", "content": "Kept"}])
+
+    mocker.patch(
+        "simple_agent.messages.storage.os.fsync",
+        side_effect=OSError("No space left on device"),
+    )
+    with pytest.raises(OSError):
+        storage.save_messages([{"role": "user", "content": "Lost"}])
+    mocker.stopall()
+
+    assert storage.load_messages() == [{"role": "user", "content": "Kept"}]
+    # The partly written temporary file was removed
+    assert [p.name for p in storage.storage_path.parent.iterdir()] == ["messages.json"]
+
+
+def test_save_leaves_no_temporary_file(storage: MessageStorage) -> None:
+    """Test that a completed save renames its temporary file into place."""
+    storage.save_messages([{"role": "user", "content": "Hello"}])
+
+    assert [p.name for p in storage.storage_path.parent.iterdir()] == ["messages.json"]
+
+
+def test_concurrent_saves(storage: MessageStorage) -> None:
+    """Test that writers saving to the same path don't interfere."""
+    errors: list[Exception] = []
+
+    def save_many(name: str) -> None:
+        try:
+            for i in range(100):
+                storage.save_messages([{"role": "user", "content": f"{name} {i}"}])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_many, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert storage.load_messages()[0]["content"] in ("a 99", "b 99")
+    assert [p.name for p in storage.storage_path.parent.iterdir()] == ["messages.json"]
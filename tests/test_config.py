@@ -1,6 +1,10 @@
 """Tests for configuration module."""
 
-from simple_agent.config import MCPServerConfig
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from simple_agent.config import MCPServerConfig, load_mcp_config
 
 
 def test_mcp_server_config_defaults() -> None:
@@ -21,3 +25,30 @@ def test_mcp_server_config_with_values() -> None:
     assert config.command == "test-command"
     assert config.args == ["--arg1", "--arg2"]
     assert config.env == {"KEY": "value"}
+
+
+def test_load_mcp_config(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test loading MCP server configuration from the config directory."""
+    mocker.patch("simple_agent.config.get_config_dir", return_value=tmp_path)
+
+    # A missing file means no servers
+    assert load_mcp_config() == {}
+
+    (tmp_path / "mcp_servers.json").write_text(
+        '{"files": {"command": "mcp-files", "args": ["--root", "."]}}'
+    )
+    servers = load_mcp_config()
+    assert servers == {
+        "files": MCPServerConfig(command="mcp-files", args=["--root", "."])
+    }
+
+
+def test_load_mcp_config_invalid(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test that an invalid config file is reported and ignored."""
+    mocker.patch("simple_agent.config.get_config_dir", return_value=tmp_path)
+    mock_warning = mocker.patch("simple_agent.config.display_warning")
+
+    (tmp_path / "mcp_servers.json").write_text('{"files": {"args": []}}')
+
+    assert load_mcp_config() == {}
+    mock_warning.assert_called_once()
@@ -1,20 +1,33 @@
 """Tests for the main module."""
 
+import pytest
 from pytest_mock import MockerFixture
 
+from simple_agent import __version__
 from simple_agent.__main__ import main
 
 
-def test_main_version(mocker: MockerFixture) -> None:
+def test_main_version(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
     """Test the main function with --version flag."""
     # Mock the arguments
     mocker.patch("sys.argv", ["simple-agent", "--version"])
-    # Mock print_formatted_text to capture output - we need to use the fully qualified module path
-    mock_print = mocker.patch("simple_agent.__main__.print_formatted_text")
 
     main()
-    # Verify print_formatted_text was called (just checking it was called, not the exact args)
-    assert mock_print.called
+    assert capsys.readouterr().out == f"simple-agent version {__version__}\n"
+
+
+def test_main_version_skips_argparse(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that a bare --version is answered without building a parser."""
+    mocker.patch("sys.argv", ["simple-agent", "--version"])
+    mock_parser = mocker.patch("argparse.ArgumentParser")
+
+    main()
+    mock_parser.assert_not_called()
+    assert "simple-agent version" in capsys.readouterr().out
 
 
 def test_main_run_agent(mocker: MockerFixture) -> None:
@@ -26,7 +39,7 @@ def test_main_run_agent(mocker: MockerFixture) -> None:
     mock_agent = mocker.MagicMock()
     mock_agent.mcp_manager = None  # No MCP manager in test
     mock_agent_class = mocker.patch(
-        "simple_agent.__main__.Agent", return_value=mock_agent
+        "simple_agent.core.agent.Agent", return_value=mock_agent
     )
 
     # Mock sys.exit to avoid actually exiting
@@ -42,7 +55,9 @@ def test_main_run_agent(mocker: MockerFixture) -> None:
     mock_exit.assert_called_once_with(0)
 
 
-def test_main_keyboard_interrupt(mocker: MockerFixture) -> None:
+def test_main_keyboard_interrupt(
+    mocker: MockerFixture, capsys: pytest.CaptureFixture[str]
+) -> None:
     """Test the main function with keyboard interrupt."""
     # Mock the arguments
     mocker.patch("sys.argv", ["simple-agent"])
@@ -50,15 +65,24 @@ def test_main_keyboard_interrupt(mocker: MockerFixture) -> None:
     # Mock Agent to raise KeyboardInterrupt
     mock_agent = mocker.MagicMock()
     mock_agent.run.side_effect = KeyboardInterrupt()
-    mocker.patch("simple_agent.__main__.Agent", return_value=mock_agent)
+    mocker.patch("simple_agent.core.agent.Agent", return_value=mock_agent)
 
-    # Mock print_formatted_text and sys.exit - use the fully qualified path
-    mock_print = mocker.patch("simple_agent.__main__.print_formatted_text")
+    # Mock sys.exit to avoid actually exiting
     mock_exit = mocker.patch("sys.exit")
 
     # Run main
     main()
 
-    # Verify that print_formatted_text was called and exit code
-    assert mock_print.called
+    # Verify the interrupt message went to stderr and the exit code
+    assert "Interrupted. Exiting." in capsys.readouterr().err
     mock_exit.assert_called_once_with(0)
+
+
+def test_main_version_skips_agent_import(mocker: MockerFixture) -> None:
+    """Test that --version returns before the agent module is imported."""
+    mocker.patch("sys.argv", ["simple-agent", "--version"])
+
+    # Hide the agent module so any import of it would fail loudly
+    mocker.patch.dict("sys.modules", {"simple_agent.core.agent": None})
+
+    main()
@@ -1,8 +1,5 @@
 """Tests for the execute_command tool."""
 
-from io import StringIO
-from unittest.mock import MagicMock
-
 from pytest_mock import MockerFixture
 
 from simple_agent.tools.exec import execute_command
@@ -29,6 +26,13 @@ def test_execute_command() -> None:
     assert return_code == 0
 
 
+def test_execute_command_binary_output() -> None:
+    """Test that output which isn't valid UTF-8 is decoded with replacements."""
+    stdout, stderr, return_code = execute_command("printf 'ok \\377\\n'")
+    assert stdout == "ok \ufffd\n"
+    assert return_code == 0
+
+
 def test_execute_command_exception(mocker: MockerFixture) -> None:
     """Test the execute_command function with an exception."""
     # Test with a command that causes a subprocess.Popen error
@@ -39,71 +43,60 @@ def test_execute_command_exception(mocker: MockerFixture) -> None:
     assert return_code == 1
 
 
-def test_execute_command_remaining_output(mocker: MockerFixture) -> None:
-    """Test reading remaining output after process completes.
+def test_execute_command_streams_output(mocker: MockerFixture) -> None:
+    """Test that output lines are displayed as soon as they are written."""
+    import time
 
-    This test specifically targets reading from stdout and stderr after a process has finished.
-    """
     from rich.padding import Padding
 
-    # Create a mock process
-    mock_process = MagicMock()
-    mock_process.poll.return_value = 0  # Process has finished
-    mock_process.returncode = 0
+    # Record when each line is displayed
+    displayed: list[tuple[float, str]] = []
 
-    # Create mock stdout and stderr with content
-    mock_stdout = StringIO("remaining stdout line\n")
-    mock_stderr = StringIO("remaining stderr line\n")
+    def record(renderable: object = "") -> None:
+        if isinstance(renderable, Padding):
+            displayed.append((time.monotonic(), str(renderable.renderable)))
 
-    # Setup process to return these streams
-    mock_process.stdout = mock_stdout
-    mock_process.stderr = mock_stderr
+    mocker.patch(
+        "simple_agent.tools.exec.execute_command.console.print", side_effect=record
+    )
 
-    # Mock select to simulate no initial output (go straight to process completed)
-    mock_select = mocker.patch("simple_agent.tools.exec.execute_command.select")
-    mock_select.return_value = ([], None, None)
+    # Several lines written at once, then a pause before the command exits
+    start = time.monotonic()
+    stdout, stderr, return_code = execute_command(
+        "printf 'one\\ntwo\\n'; printf 'err' >&2; sleep 1"
+    )
 
-    # Mock Popen to return our mock process
-    mocker.patch("subprocess.Popen", return_value=mock_process)
+    assert stdout == "one\ntwo\n"
+    assert stderr == "err"
+    assert return_code == 0
 
-    # Mock console.print
-    mock_print = mocker.patch("simple_agent.tools.exec.execute_command.console.print")
+    # Both lines were shown before the pause, not when the command exited
+    lines = {text: at - start for at, text in displayed}
+    assert lines["[dim]one[/dim]"] < 0.5
+    assert lines["[dim]two[/dim]"] < 0.5
 
-    # Call execute_command
-    stdout, stderr, return_code = execute_command("test_command")
+    # Output without a trailing newline is still displayed
+    assert "[red]err[/red]" in lines
+    assert any(text.startswith("[dim]Command completed:") for text in lines)
 
-    # Verify the function read the remaining output from stdout and stderr
-    assert "remaining stdout line" in stdout
-    assert "remaining stderr line" in stderr
 
-    # Verify console.print was called with the appropriate content
-    assert mock_print.call_count >= 3  # At least for stdout, stderr and completion
+def test_execute_command_batches_terminal_writes(mocker: MockerFixture) -> None:
+    """Test that lines read together are written to the terminal together."""
+    from io import StringIO
 
-    # Find calls with Padding objects and check their content
-    padding_calls = [
-        call
-        for call in mock_print.call_args_list
-        if len(call[0]) > 0 and isinstance(call[0][0], Padding)
-    ]
+    from rich.console import Console
 
-    # Verify stdout was printed
-    stdout_found = any(
-        "[dim]remaining stdout line[/dim]" in str(call[0][0].renderable)
-        for call in padding_calls
+    output = StringIO()
+    write = mocker.spy(output, "write")
+    mocker.patch(
+        "simple_agent.tools.exec.execute_command.console",
+        Console(file=output, width=80),
     )
-    assert stdout_found, "Expected stdout line not found in console.print calls"
 
-    # Verify stderr was printed
-    stderr_found = any(
-        "[red]remaining stderr line[/red]" in str(call[0][0].renderable)
-        for call in padding_calls
-    )
-    assert stderr_found, "Expected stderr line not found in console.print calls"
+    stdout, _, return_code = execute_command("seq 1 500")
 
-    # Verify completion message was printed
-    completion_found = any(
-        "Command completed:" in str(call[0][0].renderable) for call in padding_calls
-    )
-    assert (
-        completion_found
-    ), "Expected completion message not found in console.print calls"
+    assert stdout == "".join(f"{i}\n" for i in range(1, 501))
+    assert return_code == 0
+    assert "500" in output.getvalue()
+    # Far fewer writes than lines, one per chunk read from the pipe
+    assert write.call_count < 50